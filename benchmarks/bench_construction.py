@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from smtfe import Variable, reset  # noqa: E402
+
+SIZES = [100, 1000, 10000]
+
+
+def bench(size):
+    reset()
+    terms = [Variable() for _ in range(size)]
+    start = time.perf_counter()
+    expr = terms[0]
+    for term in terms[1:]:
+        expr = expr + term
+    expr == 0
+    return time.perf_counter() - start
+
+
+def main():
+    for size in SIZES:
+        elapsed = bench(size)
+        print(f"{size:>7} terms  {elapsed:10.4f}s  {elapsed / size * 1e6:8.2f}us/term")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from smtfe import Variable, current_context, reset  # noqa: E402
+from smtfe.cache import fingerprint  # noqa: E402
+from smtfe.convert import _collect_clauses  # noqa: E402
+
+SIZES = [250, 1000, 2000, 4000]
+
+
+def chain(size):
+    variables = [Variable() for _ in range(size + 1)]
+    variables[0] == 0
+    for p, q in zip(variables, variables[1:]):
+        q == p + 1
+    return variables
+
+
+def bench(size):
+    # A chain is the slowest shape to refine, one round per link
+    reset()
+    variables = chain(size)  # noqa: F841
+    clauses = _collect_clauses()
+    start = time.perf_counter()
+    fingerprint(clauses)
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    current_context().get_model()
+    return elapsed, time.perf_counter() - start
+
+
+def main():
+    for size in SIZES:
+        elapsed, solve = bench(size)
+        print(
+            f"{size:>7} clauses  fingerprint {elapsed:8.4f}s"
+            f"  {elapsed / size * 1e6:8.2f}us/clause  solve {solve:8.4f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from smtfe import Variable, reset  # noqa: E402
+from smtfe.convert import join_formula  # noqa: E402
+
+SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def bench(size):
+    reset()
+    a = Variable("a")
+    for i in range(size):
+        a > i
+    clauses = a.clauses
+    start = time.perf_counter()
+    join_formula(clauses)
+    return time.perf_counter() - start
+
+
+def main():
+    for size in SIZES:
+        elapsed = bench(size)
+        print(f"{size:>7} clauses  {elapsed:10.4f}s  {elapsed / size * 1e6:8.2f}us/clause")
+
+
+if __name__ == "__main__":
+    main()
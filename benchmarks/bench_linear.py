@@ -0,0 +1,57 @@
+import operator
+import os
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from smtfe import Variable, reset  # noqa: E402
+from smtfe.linear import constraints  # noqa: E402
+
+SIZES = [100, 1000, 10000]
+DENSITY = 4
+
+
+def system(size):
+    rng = numpy.random.default_rng(0)
+    A = numpy.zeros((size, size), dtype=int)
+    columns = rng.integers(0, size, (size, DENSITY))
+    A[numpy.arange(size)[:, None], columns] = rng.integers(1, 10, (size, DENSITY))
+    b = rng.integers(0, 100, size)
+    return A, b
+
+
+def bench_operators(A, b, x):
+    # Both sides start from the dense matrix, and both find its non-zeros
+    # with numpy, so only building the constraints differs
+    start = time.perf_counter()
+    for row, bound in zip(A, b.tolist()):
+        columns = numpy.flatnonzero(row)
+        expr = None
+        for coefficient, column in zip(row[columns].tolist(), columns.tolist()):
+            term = x[column] * coefficient
+            expr = term if expr is None else expr + term
+        expr <= bound
+    return time.perf_counter() - start
+
+
+def bench_bulk(A, b, x):
+    start = time.perf_counter()
+    constraints(A, x, b, operator.le)
+    return time.perf_counter() - start
+
+
+def main():
+    for size in SIZES:
+        A, b = system(size)
+        reset()
+        operators = bench_operators(A, b, [Variable() for _ in range(size)])
+        reset()
+        bulk = bench_bulk(A, b, [Variable() for _ in range(size)])
+        print(f"{size:>7} rows  operators {operators:8.4f}s  bulk {bulk:8.4f}s")
+
+
+if __name__ == "__main__":
+    main()
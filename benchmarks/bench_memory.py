@@ -0,0 +1,45 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from smtfe import BitVec, Variable, reset  # noqa: E402
+
+SIZE = 100000
+
+
+def measure(build):
+    reset()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / SIZE
+
+
+def build_variables():
+    return [Variable("v") for _ in range(SIZE)]
+
+
+def build_bitvecs():
+    return [BitVec("v", 32) for _ in range(SIZE)]
+
+
+def build_clauses():
+    a = Variable("a")
+    for i in range(SIZE):
+        a > i
+    return a
+
+
+def main():
+    print(f"{measure(build_variables):8.1f} bytes/Variable")
+    print(f"{measure(build_bitvecs):8.1f} bytes/BitVec")
+    print(f"{measure(build_clauses):8.1f} bytes/Clause")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import gc
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from smtfe import Context  # noqa: E402
+from smtfe.convert import _collect_clauses, join_formula  # noqa: E402
+from smtfe.utils import write_smt2  # noqa: E402
+
+from .workloads import WORKLOADS  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = [100, 1000]
+PHASES = ["construct", "convert", "solve", "export"]
+
+
+def _separate_phases(build, size, options):
+    # Many small problems solved one after another, as opposed to a single
+    # problem made of independent clusters
+    contexts = [Context(keep_alive=True) for _ in range(size)]
+    for context in contexts:
+        for name, value in options.items():
+            setattr(context, name, value)
+
+    def each(run):
+        def phase():
+            for index, context in enumerate(contexts):
+                with context:
+                    run(index, context)
+
+        return phase
+
+    yield "construct", each(lambda index, context: build(index))
+    yield "convert", each(
+        lambda index, context: join_formula(_collect_clauses(), context.cache)
+    )
+    yield "solve", each(lambda index, context: context.get_model())
+    yield "export", each(lambda index, context: write_smt2(io.StringIO()))
+
+
+def _phases(build, size, options):
+    options = dict(options)
+    if options.pop("separate", False):
+        yield from _separate_phases(build, size, options)
+        return
+    with Context(keep_alive=True) as context:
+        for name, value in options.items():
+            setattr(context, name, value)
+        yield "construct", lambda: build(size)
+        yield "convert", lambda: join_formula(_collect_clauses(), context.cache)
+        yield "solve", context.get_model
+        yield "export", lambda: write_smt2(io.StringIO())
+
+
+def _timed(build, size, options):
+    seconds = {}
+    for phase, run in _phases(build, size, options):
+        start = time.perf_counter()
+        run()
+        seconds[phase] = time.perf_counter() - start
+    return seconds
+
+
+def _traced(build, size, options):
+    peaks = {}
+    tracemalloc.start()
+    try:
+        for phase, run in _phases(build, size, options):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            run()
+            peaks[phase] = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def measure(name, size, repeat):
+    build, options = WORKLOADS[name]
+    # Time and memory are measured apart as tracing slows down the run
+    best = {}
+    for _ in range(repeat):
+        gc.collect()
+        for phase, seconds in _timed(build, size, options).items():
+            best[phase] = min(best.get(phase, seconds), seconds)
+    gc.collect()
+    peaks = _traced(build, size, options)
+    return {
+        phase: {"seconds": best[phase], "peak_bytes": peaks[phase]} for phase in PHASES
+    }
+
+
+def run(workloads, sizes, repeat=3):
+    # A fresh interpreter per measurement keeps pysmt's global tables from
+    # one workload out of the next one's numbers
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for name in workloads:
+        for size in sizes:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                results[f"{name}/{size}"] = executor.submit(
+                    measure, name, size, repeat
+                ).result()
+    return results
+
+
+# Differences below these are noise, e.g. pysmt's tables resizing
+NOISE = {"seconds": 0.005, "peak_bytes": 256 * 1024}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, phases in results.items():
+        for phase, measured in phases.items():
+            reference = baseline.get(key, {}).get(phase)
+            if reference is None:
+                continue
+            for metric, noise in NOISE.items():
+                limit = max(reference[metric] * tolerance, reference[metric] + noise)
+                if measured[metric] > limit:
+                    ratio = measured[metric] / max(reference[metric], 1e-9)
+                    regressions.append(f"{key} {phase} {metric} {ratio:.2f}x")
+    return regressions
+
+
+def report(results, baseline, out=sys.stdout):
+    for key, phases in results.items():
+        for phase in PHASES:
+            measured = phases[phase]
+            line = (
+                f"{key:<28} {phase:<10} {measured['seconds'] * 1000:10.2f}ms"
+                f" {measured['peak_bytes'] / 1024:10.1f}KiB"
+            )
+            reference = baseline.get(key, {}).get(phase)
+            if reference and reference["seconds"]:
+                line += f"  {measured['seconds'] / reference['seconds']:5.2f}x"
+            print(line, file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS))
+    parser.add_argument("--size", action="append", type=int)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    results = run(args.workload or list(WORKLOADS), args.size or SIZES, args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+    report(results, baseline)
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
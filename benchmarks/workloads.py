@@ -0,0 +1,70 @@
+from smtfe import BitVec, Function, Variable
+
+
+def arithmetic_chain(size):
+    variables = [Variable() for _ in range(size)]
+    for variable in variables:
+        variable >= 0
+    expr = variables[0]
+    for variable in variables[1:]:
+        expr = expr + variable
+    expr == size
+
+
+def boolean_conjunction(size):
+    for _ in range(size):
+        a = Variable()
+        b = Variable()
+        (a | b) == True  # noqa: E712
+        ~(a & b) == True  # noqa: E712
+
+
+def bitvec_chain(size):
+    registers = [BitVec(None, 32) for _ in range(size)]
+    registers[0] == 0x1234
+    for previous, register in zip(registers, registers[1:]):
+        register == previous
+
+
+def bitvec_arithmetic(size):
+    registers = [BitVec(None, 32) for _ in range(size)]
+    registers[0] == 0x1234
+    for previous, register in zip(registers, registers[1:]):
+        register == ((previous << 1) ^ previous) + 7
+
+
+def cluster(index):
+    a = Variable()
+    b = Variable()
+    a > index
+    a + b == index * 2 + 3
+    b > 0
+
+
+def independent(size):
+    # Every cluster is solved on its own, so keep their number modest
+    for index in range(max(size // 10, 1)):
+        cluster(index)
+
+
+def function_calls(size):
+    @Function.wrap
+    def exclusive(p, q):
+        return (p | q) & ~(p & q)
+
+    variables = [Variable() for _ in range(size + 1)]
+    for p, q in zip(variables, variables[1:]):
+        exclusive(p, q)
+
+
+# Each workload may enable context options suited to its shape. A separate
+# workload builds one small problem per index, each in a Context of its own
+WORKLOADS = {
+    "arithmetic_chain": (arithmetic_chain, {}),
+    "boolean_conjunction": (boolean_conjunction, {}),
+    "bitvec_chain": (bitvec_chain, {}),
+    "bitvec_arithmetic": (bitvec_arithmetic, {}),
+    "independent": (independent, {"split_components": True}),
+    "separate_problems": (cluster, {"separate": True}),
+    "function_calls": (function_calls, {}),
+}
@@ -1,22 +1,45 @@
-from .variable import Clause, Variable
+import importlib
+
+from .context import Context, current_context
+from .variable import Clause, Variable, set_hash_consing
 from .function import Function
 from .bitvec import BitVec
-from .convert import (
-    convert_to_pysmt_model as _convert_to_pysmt_model,
-    _reset as _convert_reset,
-    get_value_str,
-)
+from .array import Array
+
+# Modules which load pysmt or numpy are only imported on first use
+_lazy_modules = {
+    "aio",
+    "batch",
+    "cache",
+    "components",
+    "convert",
+    "linear",
+    "portfolio",
+    "session",
+    "simplify",
+    "utils",
+}
+_lazy_attributes = {
+    "Session": "session",
+    "get_value_str": "convert",
+}
+
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _lazy_attributes:
+        module = importlib.import_module(f".{_lazy_attributes[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def reset():
-    Variable.reset()
-    BitVec.reset()
-    Function.reset()
-    _convert_reset()
+    current_context().reset()
 
 
 def check_sat():
-    rv = _convert_to_pysmt_model()
+    rv = current_context().get_model()
     if rv:
         print("sat")
     else:
@@ -24,8 +47,10 @@ def check_sat():
 
 
 def get_model(*args, **kwargs):
-    return _convert_to_pysmt_model()
+    return current_context().get_model()
 
 
 def get_value(args: tuple):
+    from .convert import get_value_str
+
     print(get_value_str(args))
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from . import portfolio
+from .context import Context, current_context
+from .simplify import SimplifyStats, simplify
+from .convert import (
+    _collect_clauses,
+    _detach_terms,
+    evaluate,
+    join_formula,
+    pysmt_lock,
+)
+from .utils import emit_smt2
+
+
+def _prepare(context):
+    with context:
+        clauses = _collect_clauses()
+        found, model = context._lookup_model(clauses)
+        if found:
+            return clauses, None, None, model
+        with pysmt_lock:
+            f = join_formula(clauses, context.cache)
+            if context.simplify:
+                context.simplify_stats = SimplifyStats()
+                f = simplify(f, context.simplify_stats)
+            # The script is written here as pysmt's walkers are not thread safe
+            return clauses, f, emit_smt2(f), None
+
+
+async def get_model(timeout=None, solvers=None):
+    loop = asyncio.get_running_loop()
+    context = current_context()
+    cancel = threading.Event()
+
+    async def run():
+        clauses, f, script, model = await loop.run_in_executor(None, _prepare, context)
+        if f is None:
+            return model
+        _, model = await loop.run_in_executor(
+            None, portfolio.solve, f, solvers, None, cancel, script
+        )
+        context._remember_model(clauses, model)
+        return model
+
+    try:
+        return await asyncio.wait_for(run(), timeout)
+    except BaseException:
+        # Terminates the solver processes still running in the executor
+        cancel.set()
+        raise
+
+
+async def check_sat(timeout=None, solvers=None):
+    return await get_model(timeout, solvers) is not None
+
+
+async def get_value(args: tuple, timeout=None, solvers=None):
+    _detach_terms(args)
+    return evaluate(await get_model(timeout, solvers), args)
+
+
+async def solve(build, timeout=None, solvers=None):
+    with Context(keep_alive=True):
+        build()
+        return await get_model(timeout, solvers)
@@ -0,0 +1,73 @@
+from .bitvec import BitVec
+from .variable import Clause, Variable
+
+
+def select_():
+    pass
+
+
+class Array(Variable):
+    __slots__ = ("size", "bits", "theory", "_elements")
+
+    def __init__(self, name=None, size=0, bits=None, theory=False):
+        super().__init__(name)
+        self.size = size
+        self.bits = bits
+        self.theory = theory
+        # Only the elements which have been used are ever created
+        self._elements = None
+
+    def __repr__(self):
+        return f"Array({id(self)})"
+
+    def __len__(self):
+        return self.size
+
+    def _index(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"index {index} out of range for {self.name}")
+        return index
+
+    def _bounded(self, index):
+        # The theory of arrays is unbounded, so a symbolic index is kept
+        # within the size of the array by its own clauses
+        if isinstance(index, Clause):
+            variable = Variable()
+            variable == index
+            index = variable
+        index >= 0
+        index < self.size
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.size))]
+        if isinstance(index, (Variable, Clause)):
+            if not self.theory:
+                raise TypeError("symbolic indices require an Array with theory=True")
+            return self.apply(select_, self._bounded(index))
+        index = self._index(index)
+        if self.theory:
+            return self.apply(select_, index)
+        if self._elements is None:
+            self._elements = {}
+        element = self._elements.get(index)
+        if element is None:
+            name = f"{self.name}_{index}"
+            if self.bits is None:
+                element = Variable(name)
+            else:
+                element = BitVec(name, self.bits)
+            self._elements[index] = element
+        return element
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def touched(self):
+        if not self._elements:
+            return {}
+        return dict(sorted(self._elements.items()))
@@ -0,0 +1,41 @@
+import io
+import pickle
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .context import Context
+from .utils import load_smt2, write_smt2
+
+
+def _solve_problem(problem):
+    with Context(keep_alive=True) as context:
+        if isinstance(problem, str):
+            load_smt2(io.StringIO(problem))
+        else:
+            problem()
+        model = context.get_model()
+    if model is None:
+        return None
+    return {symbol.symbol_name(): value.constant_value() for symbol, value in model}
+
+
+def _portable(problem):
+    if isinstance(problem, str):
+        return problem
+    try:
+        pickle.dumps(problem)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        # Closures cannot be sent to a worker, so they are built here and
+        # sent as SMT-LIB instead
+        with Context(keep_alive=True):
+            problem()
+            fh = io.StringIO()
+            write_smt2(fh)
+            return fh.getvalue()
+    return problem
+
+
+def solve_batch(problems, workers=None, chunksize=1):
+    problems = (_portable(problem) for problem in problems)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_solve_problem, problems, chunksize=chunksize))
@@ -1,7 +1,36 @@
-from .variable import Variable
+from .variable import Clause, Variable
+
+
+def extract_():
+    pass
+
+
+def concat_():
+    pass
+
+
+def _extract(self, high, low):
+    if not 0 <= low <= high:
+        raise ValueError(f"invalid bit range [{high}:{low}]")
+    return self.apply(extract_, slice(high, low))
+
+
+def _concat(self, other):
+    if not isinstance(other, (Variable, Clause)):
+        raise TypeError("concat needs a BitVec or bit-vector expression")
+    return self.apply(concat_, other)
 
 
 class BitVec(Variable):
+    __slots__ = ("bits",)
+
     def __init__(self, name=None, bits=1):
         self.bits = bits
         super().__init__(name)
+
+    extract = _extract
+    concat = _concat
+
+
+setattr(Clause, "extract", _extract)
+setattr(Clause, "concat", _concat)
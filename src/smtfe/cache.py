@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from pysmt.solvers.eager import EagerModel
+from pysmt.typing import BOOL, INT, BVType
+
+from .array import Array
+from .bitvec import BitVec
+from .convert import _constant, _get_symbol, pysmt_lock
+from .function import Application
+from .linear import LinearTerm
+from .variable import Clause, Variable, function_
+
+_CLOSE = object()
+
+
+def _kind(variable):
+    if isinstance(variable, Array):
+        return f"a:{variable.size}:{variable.bits}:{variable.theory}"
+    if variable._symbol is not None:
+        return f"v:{variable._symbol.symbol_type()}"
+    if isinstance(variable, BitVec):
+        return f"v:bv{variable.bits}"
+    return "v"
+
+
+def _serialize(clause, label):
+    tokens = []
+    stack = [clause]
+    while stack:
+        node = stack.pop()
+        if node is _CLOSE:
+            tokens.append(")")
+        elif isinstance(node, Application):
+            # The body is part of the problem, so it is part of the key too
+            tokens.append(f"(call:{node.this.name}:{{{_serialize_body(node.this, label)}}}")
+            stack.append(_CLOSE)
+            stack.extend(reversed(node.args))
+        elif isinstance(node, LinearTerm):
+            tokens.append("(dot")
+            tokens.extend(f"int:{coefficient}" for coefficient in node.coefficients)
+            stack.append(_CLOSE)
+            stack.extend(reversed(node.variables))
+        elif isinstance(node, Clause):
+            if node.operator is function_:
+                tokens.append(f"(fn:{node.name}")
+            else:
+                tokens.append(f"({node.operator.__name__}")
+            stack.append(_CLOSE)
+            stack.append(node.other)
+            stack.append(node.this)
+        elif isinstance(node, Variable):
+            tokens.append(label(node))
+        else:
+            tokens.append(f"{type(node).__name__}:{node!r}")
+    return " ".join(tokens)
+
+
+def _serialize_body(function, label):
+    parameters = {
+        parameter: f"arg:{index}"
+        for index, parameter in enumerate(function._parameters_template())
+    }
+
+    def body_label(variable):
+        parameter = parameters.get(variable)
+        if parameter is None:
+            return label(variable)
+        return parameter
+
+    return _serialize(function._body_template(), body_label)
+
+
+def _numbering(numbers):
+    def label(variable):
+        number = numbers.get(variable)
+        if number is None:
+            number = numbers[variable] = len(numbers)
+        return f"{_kind(variable)}#{number}"
+
+    return label
+
+
+def _ranks(keys):
+    ranking = {key: rank for rank, key in enumerate(sorted(set(keys)))}
+    return [ranking[key] for key in keys]
+
+
+# Each round is linear, but long chains only stop splitting after a round
+# per link. Ties left after the last round fall back to clause order, which
+# costs a cache miss but never a wrong hit
+_REFINE_ROUNDS = 8
+
+
+def _refine(clauses):
+    # Colour variables by their kind, then repeatedly by the clauses they
+    # occur in and where, until the partition stops splitting. Clauses are
+    # then ranked by their shape under the final colouring
+    shapes = []
+    occurrences = []
+    for clause in clauses:
+        variables = []
+
+        def label(variable):
+            variables.append(variable)
+            return _kind(variable)
+
+        shapes.append(_serialize(clause, label))
+        occurrences.append(variables)
+    shapes = _ranks(shapes)
+    variables = list({id(v): v for vs in occurrences for v in vs}.values())
+    index = {id(variable): i for i, variable in enumerate(variables)}
+    occurrences = [tuple(index[id(variable)] for variable in vs) for vs in occurrences]
+    colors = _ranks([_kind(variable) for variable in variables])
+    classes = len(set(colors))
+    for _ in range(_REFINE_ROUNDS):
+        clause_colors = _ranks(
+            [(shape, *[colors[i] for i in vs]) for shape, vs in zip(shapes, occurrences)]
+        )
+        signatures = [[color] for color in colors]
+        for clause_color, vs in zip(clause_colors, occurrences):
+            for position, i in enumerate(vs):
+                signatures[i].append((clause_color, position))
+        colors = _ranks([(s[0], *sorted(s[1:])) for s in signatures])
+        refined = len(set(colors))
+        if refined == classes or refined == len(variables):
+            break
+        classes = refined
+    return _ranks(
+        [(shape, *[colors[i] for i in vs]) for shape, vs in zip(shapes, occurrences)]
+    )
+
+
+def fingerprint(clauses):
+    # Order clauses canonically with variables anonymised, then number
+    # variables by first occurrence so renaming does not change the digest
+    keyed = sorted((color, index) for index, color in enumerate(_refine(clauses)))
+    numbers = {}
+    label = _numbering(numbers)
+    digest = hashlib.sha256()
+    for _, index in keyed:
+        digest.update(_serialize(clauses[index], label).encode())
+        digest.update(b"\n")
+    variables = sorted(numbers, key=numbers.get)
+    return digest.hexdigest(), variables
+
+
+def _sort_name(symbol_type):
+    if symbol_type.is_bv_type():
+        return f"bv{symbol_type.width}"
+    if symbol_type not in (BOOL, INT):
+        raise KeyError(str(symbol_type))
+    return str(symbol_type)
+
+
+def _sort(name):
+    if name.startswith("bv"):
+        return BVType(int(name[2:]))
+    return {"Bool": BOOL, "Int": INT}[name]
+
+
+def dump_model(model, variables):
+    if model is None:
+        return {"sat": False}
+    values = []
+    with pysmt_lock:
+        for index, variable in enumerate(variables):
+            if variable._symbol is None:
+                continue
+            symbol_type = variable._symbol.symbol_type()
+            value = model.get_value(variable._symbol).constant_value()
+            values.append([index, _sort_name(symbol_type), value])
+    return {"sat": True, "values": values}
+
+
+def load_model(entry, variables):
+    if not entry["sat"]:
+        return None
+    assignment = {}
+    with pysmt_lock:
+        for index, sort_name, value in entry["values"]:
+            symbol_type = _sort(sort_name)
+            symbol = _get_symbol(variables[index], symbol_type)
+            if symbol.symbol_type() != symbol_type:
+                raise KeyError(sort_name)
+            assignment[symbol] = _constant(symbol_type, value)
+        return EagerModel(assignment)
+
+
+class ResultCache:
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path) as fh:
+                entry = json.load(fh)
+            # Keep recently used entries at the back of the eviction order
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        data = json.dumps(entry)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as fh:
+            fh.write(data)
+        path = self._path(key)
+        try:
+            self._size -= os.path.getsize(path)
+        except OSError:
+            pass
+        os.replace(tmp, path)
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self._size = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+
+    def clear(self):
+        for path, _, _ in list(self._entries()):
+            os.remove(path)
+        self._size = 0
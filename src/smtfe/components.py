@@ -0,0 +1,102 @@
+from pysmt.solvers.eager import EagerModel
+
+from .convert import (
+    _complete_model,
+    _convert_clauses,
+    _solve_formula,
+    get_variables,
+    pysmt_lock,
+)
+from .portfolio import _solve_script, _to_model
+from .stats import NULL_STATS
+from .utils import emit_smt2
+
+
+def split_components(clauses):
+    parent = {}
+
+    def find(key):
+        root = key
+        while parent[root] != root:
+            root = parent[root]
+        while parent[key] != root:
+            parent[key], key = root, parent[key]
+        return root
+
+    anchors = []
+    for clause in clauses:
+        variables = get_variables(clause)
+        variables.add(clause._find_variable())
+        keys = [id(variable) for variable in variables]
+        for key in keys:
+            parent.setdefault(key, key)
+        root = find(keys[0])
+        for key in keys[1:]:
+            other = find(key)
+            if other != root:
+                parent[other] = root
+        anchors.append(keys[0])
+    components = {}
+    for clause, key in zip(clauses, anchors):
+        components.setdefault(find(key), []).append(clause)
+    return list(components.values())
+
+
+def solve_components(
+    clauses,
+    cache=None,
+    previous=None,
+    executor=None,
+    simplify_stats=None,
+    profile=NULL_STATS,
+):
+    solved = {}
+    pending = []
+    with profile.phase("split"):
+        parts = split_components(clauses)
+    for component in parts:
+        key = tuple(id(clause) for clause in component)
+        entry = previous.get(key) if previous else None
+        if entry is not None and all(old is new for old, new in zip(entry[0], component)):
+            solved[key] = entry
+        else:
+            pending.append((key, component))
+    profile.count("components", len(parts))
+    profile.count("components_solved", len(pending))
+
+    with pysmt_lock:
+        formulas = [_convert_clauses(component, cache, profile) for _, component in pending]
+        queries = formulas
+        if simplify_stats is not None:
+            from .simplify import simplify
+
+            with profile.phase("simplify"):
+                queries = [simplify(f, simplify_stats) for f in formulas]
+        if executor is not None:
+            scripts = [emit_smt2(query) for query in queries]
+
+    if executor is None:
+        models = []
+        for f, query in zip(formulas, queries):
+            with pysmt_lock:
+                model = _solve_formula(query, profile)
+                with profile.phase("complete"):
+                    model = _complete_model(model, f)
+            models.append(model)
+            if model is None:
+                break
+    else:
+        # z3 is not thread safe, so this is meant for a process pool
+        with profile.phase("solve"):
+            results = list(executor.map(_solve_script, scripts))
+        with pysmt_lock:
+            models = [_to_model(f, values) for f, values in zip(formulas, results)]
+
+    for (key, component), model in zip(pending, models):
+        solved[key] = (component, model)
+    assignment = {}
+    for _, model in solved.values():
+        if model is None:
+            return None, solved
+        assignment.update(dict(model))
+    return EagerModel(assignment), solved
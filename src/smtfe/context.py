@@ -0,0 +1,181 @@
+import contextvars
+
+from weakref import WeakSet
+
+from .naming import default_naming
+
+_current_context = contextvars.ContextVar("smtfe_context", default=None)
+
+
+class Context:
+    def __init__(self, keep_alive=False, naming=None):
+        self._instances = {}
+        # Problem-scoped contexts may hold their instances strongly
+        self._alive = [] if keep_alive else None
+        self._tokens = []
+        self._cache = None
+        self._session = None
+        self._last_model = None
+        self.cons_table = None
+        self.result_cache = None
+        self.naming = naming if naming is not None else default_naming
+        self.simplify = False
+        self.simplify_stats = None
+        self.split_components = False
+        self.component_executor = None
+        self._components = None
+        self.profile = False
+        self.stats_callbacks = []
+        self.last_stats = None
+
+    def __enter__(self):
+        self._tokens.append(_current_context.set(self))
+        return self
+
+    def __exit__(self, *args):
+        _current_context.reset(self._tokens.pop())
+
+    def instances(self, cls):
+        registry = self._instances.get(cls)
+        if registry is None:
+            registry = self._instances[cls] = WeakSet()
+        return registry
+
+    def register(self, instance):
+        self.instances(type(instance)).add(instance)
+        if self._alive is not None:
+            self._alive.append(instance)
+
+    def registries(self):
+        return list(self._instances.items())
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            from .convert import ConversionCache
+
+            self._cache = ConversionCache()
+        return self._cache
+
+    @property
+    def session(self):
+        if self._session is None:
+            from .session import Session
+
+            self._session = Session(context=self)
+        return self._session
+
+    def reset(self):
+        self._instances.clear()
+        if self._alive is not None:
+            self._alive.clear()
+        if self.cons_table is not None:
+            self.cons_table.clear()
+        if self._cache is not None:
+            self._cache.clear()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self._last_model = None
+        self._components = None
+
+    def _lookup_model(self, clauses):
+        last = self._last_model
+        if last is None or len(last[0]) != len(clauses):
+            return False, None
+        if all(old is new for old, new in zip(last[0], clauses)):
+            return True, last[1]
+        return False, None
+
+    def _remember_model(self, clauses, model):
+        self._last_model = (clauses, model)
+
+    def _solve_clauses(self, clauses, profile):
+        from .convert import solve_clauses
+
+        simplify_stats = None
+        if self.simplify:
+            from .simplify import SimplifyStats
+
+            simplify_stats = self.simplify_stats = SimplifyStats()
+        if not self.split_components:
+            return solve_clauses(clauses, self.cache, simplify_stats, profile)
+
+        from .components import solve_components
+
+        model, self._components = solve_components(
+            clauses,
+            self.cache,
+            self._components,
+            self.component_executor,
+            simplify_stats,
+            profile,
+        )
+        return model
+
+    def _solve(self, clauses, profile):
+        if self.result_cache is None:
+            return self._solve_clauses(clauses, profile)
+
+        from .cache import dump_model, fingerprint, load_model
+
+        with profile.phase("fingerprint"):
+            key, variables = fingerprint(clauses)
+        entry = self.result_cache.get(key)
+        if entry is not None:
+            try:
+                model = load_model(entry, variables)
+            except (KeyError, IndexError, ValueError):
+                pass
+            else:
+                profile.count("result_cache_hits")
+                return model
+        model = self._solve_clauses(clauses, profile)
+        try:
+            entry = dump_model(model, variables)
+        except KeyError:
+            # Sorts such as arrays have no compact stored form
+            return model
+        self.result_cache.put(key, entry)
+        return model
+
+    def _profile(self):
+        from .stats import NULL_STATS, SolveStats
+
+        if self.profile or self.stats_callbacks:
+            return SolveStats()
+        return NULL_STATS
+
+    def get_model(self):
+        from .convert import _collect_clauses
+
+        profile = self._profile()
+        with self, profile.phase("total"):
+            with profile.phase("collect"):
+                clauses = _collect_clauses()
+            profile.count("clauses", len(clauses))
+            found, model = self._lookup_model(clauses)
+            if found:
+                profile.count("model_cache_hits")
+            else:
+                model = self._solve(clauses, profile)
+                self._remember_model(clauses, model)
+        if profile.enabled:
+            profile.count("sat", model is not None)
+            self.last_stats = profile
+            for callback in self.stats_callbacks:
+                callback(profile)
+        return model
+
+    def check_sat(self):
+        return self.get_model() is not None
+
+
+_default_context = Context()
+
+
+def current_context():
+    context = _current_context.get()
+    if context is None:
+        return _default_context
+    return context
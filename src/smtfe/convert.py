@@ -1,5 +1,7 @@
-import functools
 import operator
+import threading
+
+from weakref import WeakValueDictionary
 
 import pysmt.operators as op
 
@@ -7,43 +9,101 @@ from pysmt.shortcuts import (
     And,
     Bool,
     BV,
+    BVAdd,
+    BVAnd,
+    BVConcat,
+    BVExtract,
+    BVLShl,
+    BVLShr,
+    BVMul,
+    BVNot,
+    BVOr,
+    BVSub,
+    BVUDiv,
+    BVUGE,
+    BVUGT,
+    BVULE,
+    BVULT,
+    BVURem,
+    BVXor,
+    Equals,
     EqualsOrIff,
+    FreshSymbol,
     Function,
-    get_model,
+    GE,
     GT,
     Int,
+    LE,
     LT,
+    Minus,
     Not,
     Or,
     Plus,
+    Select,
     Symbol,
     Times,
+    Xor,
+    get_env,
 )
-from pysmt.typing import FunctionType, BOOL, INT, BVType
-
-from .variable import Clause, Variable, function_
-from .function import Function as Function_
-from .bitvec import BitVec
+from pysmt.exceptions import PysmtTypeError
+from pysmt.oracles import get_logic
+from pysmt.solvers.eager import EagerModel
+from pysmt.typing import ArrayType, FunctionType, BOOL, INT, BVType
 
-_variable_symbol_cache = {}
+from .variable import Clause, Variable, _commutative_operators, function_
+from .array import select_
+from .function import Application, Function as Function_
+from .linear import LinearTerm
+from .bitvec import BitVec, concat_, extract_
+from .context import current_context
+from .stats import NULL_STATS, _dag_size
 
+# pysmt's formula manager and the z3 bindings are shared by the whole process
+pysmt_lock = threading.RLock()
 
-def _reset():
-    _variable_symbol_cache.clear()
-
+# The Function which owns each function symbol, as pysmt symbols are global
+_function_symbol_owners = WeakValueDictionary()
 
 _operator_smt_mapping = {
     operator.and_: And,
     operator.gt: GT,
     operator.lt: LT,
+    operator.ge: GE,
+    operator.le: LE,
     operator.eq: EqualsOrIff,
     operator.mul: Times,
     operator.add: Plus,
+    operator.sub: Minus,
     operator.or_: Or,
     operator.invert: Not,
+    operator.xor: Xor,
+    operator.ne: lambda this, other: Not(EqualsOrIff(this, other)),
     function_: Function,
 }
 
+# Operands of bit-vector type lower to the unsigned bit-vector operations
+_operator_bv_mapping = {
+    operator.add: BVAdd,
+    operator.sub: BVSub,
+    operator.mul: BVMul,
+    operator.floordiv: BVUDiv,
+    operator.truediv: BVUDiv,
+    operator.mod: BVURem,
+    operator.and_: BVAnd,
+    operator.or_: BVOr,
+    operator.xor: BVXor,
+    operator.invert: BVNot,
+    operator.lshift: BVLShl,
+    operator.rshift: BVLShr,
+    operator.lt: BVULT,
+    operator.le: BVULE,
+    operator.gt: BVUGT,
+    operator.ge: BVUGE,
+    operator.eq: Equals,
+    operator.ne: lambda this, other: Not(Equals(this, other)),
+    concat_: BVConcat,
+}
+
 _symbol_smt_mapping = {
     int: INT,
     bool: BOOL,
@@ -52,35 +112,87 @@ _native_smt_mapping = {
     int: Int,
     bool: Bool,
 }
+_symbol_py_mapping = {
+    INT: int,
+    BOOL: bool,
+}
 
-
-def _operator_to_pysmt(op):
+def _constant(symbol_type, value):
+    if symbol_type.is_bool_type():
+        return Bool(value)
+    if symbol_type.is_bv_type():
+        if value < 0:
+            # Negative ints are written in two's complement
+            value %= 1 << symbol_type.width
+        return BV(value, symbol_type.width)
+    return Int(value)
+
+
+def _operator_to_pysmt(op, operand=None):
+    if operand is not None and operand.get_type().is_bv_type():
+        lowered = _operator_bv_mapping.get(op)
+        if lowered is not None:
+            return lowered
     return _operator_smt_mapping[op]
 
 
 def _get_symbol(variable, pysmt_symbol_type):
     # TODO: existing symbol should have the same pysmt_type
     if not variable._symbol:
-        variable._symbol = Symbol(variable.name, pysmt_symbol_type)
+        try:
+            variable._symbol = Symbol(variable.name, pysmt_symbol_type)
+        except PysmtTypeError:
+            # pysmt symbols belong to the whole process, so a name another
+            # context declared with a different sort gets a fresh symbol
+            variable._symbol = FreshSymbol(
+                pysmt_symbol_type, template=f"{variable.name}%d"
+            )
     return variable._symbol
 
 
-def _derive_py_type(val):
+def _leaf_py_type(val):
     if val is None:
         return None
     if isinstance(val, Variable):
-        return None
+        if val._symbol is None:
+            return None
+        return _symbol_py_mapping.get(val._symbol.symbol_type())
+    if isinstance(val, Application):
+        return _application_py_type(val)
+    if isinstance(val, LinearTerm):
+        return int
     if isinstance(val, Clause):
-        py_type = _derive_py_type(val.this)
-        if py_type is not None:
-            return py_type
-        py_type = _derive_py_type(val.other)
+        return int if val.this.bits is None else None
+    return type(val)
+
+
+def _derive_py_type(val):
+    # The first typed operand found depth first, left to right, otherwise
+    # bool when all operands below a boolean operator are untyped, and int
+    # when they are only ever ordered
+    fallback = None
+    stack = [(val, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            if node.operator in [operator.and_, operator.or_, operator.invert]:
+                return bool
+            if node.operator in [operator.lt, operator.le, operator.gt, operator.ge]:
+                fallback = int
+            continue
+        if (
+            isinstance(node, Clause)
+            and not isinstance(node, (Application, LinearTerm))
+            and node.operator is not select_
+        ):
+            stack.append((node, True))
+            stack.append((node.other, False))
+            stack.append((node.this, False))
+            continue
+        py_type = _leaf_py_type(node)
         if py_type is not None:
             return py_type
-        if val.operator in [operator.and_, operator.or_, operator.invert]:
-            return bool
-        return None
-    return type(val)
+    return fallback
 
 
 def _derive_symbol_type(val):
@@ -95,118 +207,506 @@ def _derive_native_type(val):
     return _native_smt_mapping[py_type]
 
 
-def convert_to_pysmt_formula(clause):
-    clause_op_pysmt = _operator_to_pysmt(clause.operator)
+def _application_py_type(application):
+    function = application.this
+    if function._returns_bool():
+        return bool
+    py_type = _derive_py_type(function._body_template())
+    if py_type is not None:
+        return py_type
+    for arg in application.args:
+        py_type = _derive_py_type(arg)
+        if py_type is not None:
+            return py_type
+    return None
+
+
+class ConversionCache:
+    def __init__(self, inline_functions=True):
+        self._entries = {}
+        # Function applications are either expanded in place or kept as
+        # calls, with their definitions collected for define-fun
+        self.inline_functions = inline_functions
+        self.definitions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, clause, children=()):
+        # An entry is only valid while its children still convert to the same
+        # nodes, so a change anywhere below the clause invalidates it too
+        entry = self._entries.get(id(clause))
+        if (
+            entry is not None
+            and entry[0] is clause
+            and entry[1] is clause.this
+            and entry[2] is clause.operator
+            and entry[3] is clause.other
+            and len(entry[4]) == len(children)
+            and all(old is new for old, new in zip(entry[4], children))
+        ):
+            self.hits += 1
+            return entry[5]
+        self.misses += 1
+        return None
+
+    def add(self, clause, node, children=()):
+        self._entries[id(clause)] = (
+            clause,
+            clause.this,
+            clause.operator,
+            clause.other,
+            tuple(children),
+            node,
+        )
+
+    def discard(self, clause):
+        self._entries.pop(id(clause), None)
+
+    def clear(self):
+        self._entries.clear()
+        self.definitions.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _clause_children(clause):
+    if isinstance(clause, Application):
+        return [arg for arg in clause.args if isinstance(arg, Clause)]
+    if isinstance(clause, LinearTerm):
+        return []
+    children = []
+    if isinstance(clause.this, Clause) and clause.operator is not select_:
+        children.append(clause.this)
+    if isinstance(clause.other, Clause):
+        children.append(clause.other)
+    return children
+
+
+def convert_to_pysmt_formula(clause, cache=None):
+    # Children are converted before their parents with an explicit stack, so
+    # deep expressions do not hit the recursion limit. Cached entries are
+    # checked bottom-up, once the children are known
+    done = {}
+    stack = [(clause, False)]
+    while stack:
+        node, expanded = stack.pop()
+        key = id(node)
+        if key in done:
+            continue
+        if not expanded:
+            stack.append((node, True))
+            for child in reversed(_clause_children(node)):
+                if id(child) not in done:
+                    stack.append((child, False))
+            continue
+        children = ()
+        if cache is not None:
+            children = [done[id(child)] for child in _clause_children(node)]
+            converted = cache.get(node, children)
+            if converted is not None:
+                done[key] = converted
+                continue
+        converted = _convert_to_pysmt_formula(node, cache, done)
+        if cache is not None:
+            cache.add(node, converted, children)
+        done[key] = converted
+    return done[id(clause)]
+
+
+def _function_symbol(function, function_type):
+    try:
+        symbol = Symbol(function.name, function_type)
+    except PysmtTypeError:
+        # The name is already taken by a symbol of another type
+        symbol = None
+    if symbol is not None:
+        owner = _function_symbol_owners.setdefault(symbol, function)
+        if owner is function:
+            return symbol
+    # Another Function of the same name and signature has a different body
+    symbol = FreshSymbol(function_type, template=function.name + ".%d")
+    _function_symbol_owners[symbol] = function
+    return symbol
+
+
+def _function_definition(function, signature):
+    definition = function._definitions.get(signature)
+    if definition is not None:
+        return definition
+
+    def make_parameter(index, name):
+        symbol_type = signature[index]
+        if symbol_type.is_bv_type():
+            parameter = BitVec(None, symbol_type.width)
+        else:
+            parameter = Variable()
+        parameter._symbol = FreshSymbol(symbol_type, template=f"{function.name}.{name}%d")
+        return parameter
+
+    params, body = function._instantiate(make_parameter)
+    if isinstance(body, Clause):
+        body_node = convert_to_pysmt_formula(body)
+    elif isinstance(body, Variable):
+        body_node = body._symbol
+    else:
+        body_node = _native_smt_mapping[type(body)](body)
+    function_type = FunctionType(body_node.get_type(), signature)
+    function_symbol = _function_symbol(function, function_type)
+    definition = ([param._symbol for param in params], body_node, function_symbol)
+    function._definitions[signature] = definition
+    return definition
+
+
+def _convert_application(clause, cache, done):
+    function = clause.this
+    args = []
+    for arg in clause.args:
+        if isinstance(arg, Clause):
+            args.append(done[id(arg)])
+        elif isinstance(arg, BitVec):
+            args.append(_get_symbol(arg, BVType(arg.bits)))
+        elif isinstance(arg, Variable):
+            args.append(arg._symbol)
+        else:
+            args.append(None)
+    if None in args:
+        # Untyped variables and constants follow the typed arguments
+        symbol_type = next((arg.get_type() for arg in args if arg is not None), None)
+        if symbol_type is None:
+            py_type = _derive_py_type(function._body_template())
+            if py_type is None:
+                py_type = next(
+                (type(arg) for arg in clause.args if not isinstance(arg, Variable)),
+                None,
+            )
+            assert py_type
+            symbol_type = _symbol_smt_mapping[py_type]
+        for index, arg in enumerate(clause.args):
+            if args[index] is not None:
+                continue
+            if isinstance(arg, Variable):
+                args[index] = _get_symbol(arg, symbol_type)
+            else:
+                args[index] = _constant(symbol_type, arg)
+    signature = tuple(arg.get_type() for arg in args)
+    params, body, function_symbol = _function_definition(function, signature)
+    if cache is None or cache.inline_functions:
+        return body.substitute(dict(zip(params, args)))
+    cache.definitions[function_symbol] = (params, body)
+    return Function(function_symbol, args)
+
+
+def _convert_linear(clause):
+    products = [
+        _get_symbol(variable, INT)
+        if coefficient == 1
+        else Times(Int(coefficient), _get_symbol(variable, INT))
+        for coefficient, variable in zip(clause.coefficients, clause.variables)
+    ]
+    if not products:
+        return Int(0)
+    if len(products) == 1:
+        return products[0]
+    return Plus(products)
+
+
+def _element_type(array):
+    if array.bits is None:
+        return INT
+    return BVType(array.bits)
+
+
+def _convert_select(clause, done):
+    array = clause.this
+    symbol = _get_symbol(array, ArrayType(INT, _element_type(array)))
+    index = clause.other
+    if isinstance(index, Variable):
+        index = _get_symbol(index, INT)
+    elif isinstance(index, Clause):
+        index = done[id(index)]
+    else:
+        index = Int(index)
+    return Select(symbol, index)
+
+
+def _operand_symbol_type(variable, clause, converted):
+    if variable._symbol is not None:
+        return variable._symbol.symbol_type()
+    if isinstance(variable, BitVec):
+        return BVType(variable.bits)
+    if converted is not None:
+        return converted.get_type()
+    return _derive_symbol_type(clause)
+
+
+def _convert_extract(clause, done):
+    if isinstance(clause.this, Variable):
+        this = _get_symbol(clause.this, _operand_symbol_type(clause.this, clause, None))
+    else:
+        this = done[id(clause.this)]
+    return BVExtract(this, clause.other.stop, clause.other.start)
+
+
+def _convert_to_pysmt_formula(clause, cache, done):
+    if clause.operator is select_:
+        return _convert_select(clause, done)
+    if clause.operator is extract_:
+        return _convert_extract(clause, done)
+    if isinstance(clause, Application):
+        return _convert_application(clause, cache, done)
+    if isinstance(clause, LinearTerm):
+        return _convert_linear(clause)
 
     if isinstance(clause.this, Variable) and clause.operator in [
         function_,
         operator.invert,
     ]:
-        symbol_type_pysmt = _derive_symbol_type(clause)
+        symbol_type_pysmt = _operand_symbol_type(clause.this, clause, None)
         this = _get_symbol(clause.this, symbol_type_pysmt)
-        return clause_op_pysmt(this)
+        return _operator_to_pysmt(clause.operator, this)(this)
     elif isinstance(clause.this, Variable) and isinstance(clause.other, Variable):
-        symbol_type_pysmt = _derive_symbol_type(clause)
+        symbol_type_pysmt = _operand_symbol_type(clause.this, clause, None)
         this = _get_symbol(clause.this, symbol_type_pysmt)
+        if isinstance(clause.other, BitVec):
+            # Bit-vector operands keep their own widths, e.g. for concat
+            symbol_type_pysmt = _operand_symbol_type(clause.other, clause, None)
         other = _get_symbol(clause.other, symbol_type_pysmt)
-        return clause_op_pysmt(other, this)
+        clause_op_pysmt = _operator_to_pysmt(clause.operator, this)
+        if clause.operator in _commutative_operators:
+            return clause_op_pysmt(other, this)
+        return clause_op_pysmt(this, other)
     elif isinstance(clause.this, Variable):
-        if isinstance(clause.this, BitVec):
-            symbol_type_pysmt = BVType(clause.this.bits)
-            native_type_pysmt = functools.partial(BV, width=clause.this.bits)
-        else:
-            symbol_type_pysmt = _derive_symbol_type(clause)
-            native_type_pysmt = _derive_native_type(clause)
-
-        this = _get_symbol(clause.this, symbol_type_pysmt)
-
         if isinstance(clause.other, Clause):
-            other = convert_to_pysmt_formula(clause.other)
-        else:
-            other = native_type_pysmt(clause.other)
-
-        return clause_op_pysmt(this, other)
+            other = done[id(clause.other)]
+            symbol_type_pysmt = _operand_symbol_type(clause.this, clause, other)
+            this = _get_symbol(clause.this, symbol_type_pysmt)
+            return _operator_to_pysmt(clause.operator, this)(this, other)
+        symbol_type_pysmt = _operand_symbol_type(clause.this, clause, None)
+        this = _get_symbol(clause.this, symbol_type_pysmt)
+        other = _constant(symbol_type_pysmt, clause.other)
+        return _operator_to_pysmt(clause.operator, this)(this, other)
     elif isinstance(clause.other, Variable):
-        if isinstance(clause.other, BitVec):
-            symbol_type_pysmt = BVType(clause.other.bits)
-            native_type_pysmt = functools.partial(BV, width=clause.other.bits)
-        else:
-            symbol_type_pysmt = _derive_symbol_type(clause)
-            native_type_pysmt = _derive_native_type(clause)
-
-        other = _get_symbol(clause.this, symbol_type_pysmt)
-
         if isinstance(clause.this, Clause):
-            this = convert_to_pysmt_formula(clause.this)
+            this = done[id(clause.this)]
+            symbol_type_pysmt = _operand_symbol_type(clause.other, clause, this)
+            other = _get_symbol(clause.other, symbol_type_pysmt)
         else:
-            this = native_type_pysmt(clause.this)
-
-        return clause_op_pysmt(other, this)
+            symbol_type_pysmt = _operand_symbol_type(clause.other, clause, None)
+            other = _get_symbol(clause.other, symbol_type_pysmt)
+            this = _constant(symbol_type_pysmt, clause.this)
+        return _operator_to_pysmt(clause.operator, other)(this, other)
     elif isinstance(clause.this, Clause):
-        this = convert_to_pysmt_formula(clause.this)
+        this = done[id(clause.this)]
+        clause_op_pysmt = _operator_to_pysmt(clause.operator, this)
         if isinstance(clause.other, Clause):
-            other = convert_to_pysmt_formula(clause.other)
+            other = done[id(clause.other)]
             return clause_op_pysmt(this, other)
         elif clause.operator == function_:
-            vars = sorted(get_variables(clause.this))
-            syms = [var._symbol for var in vars]
-            func_symbol_type = FunctionType(BOOL, [BOOL, BOOL])
-            func_symbol = Symbol(clause.name, func_symbol_type)
-            func_node = Function(func_symbol, syms)
+            if clause._free_variables is None:
+                clause._free_variables = sorted(
+                    get_variables(clause.this), key=lambda var: var.name
+                )
+            syms = [var._symbol for var in clause._free_variables]
+            if clause._symbol is None:
+                func_symbol_type = FunctionType(
+                    this.get_type(), [sym.symbol_type() for sym in syms]
+                )
+                clause._symbol = _function_symbol(clause, func_symbol_type)
+            func_node = Function(clause._symbol, syms)
             return EqualsOrIff(func_node, this)
         elif clause.operator == operator.invert:
             return clause_op_pysmt(this)
+        if this.get_type().is_bv_type():
+            return clause_op_pysmt(this, _constant(this.get_type(), clause.other))
         native_type_pysmt = _derive_native_type(clause.other)
         other = native_type_pysmt(clause.other)
         return clause_op_pysmt(this, other)
+    elif isinstance(clause.other, Clause):
+        # A reflected operator such as 10 - (a * 2)
+        other = done[id(clause.other)]
+        this = _constant(other.get_type(), clause.this)
+        return _operator_to_pysmt(clause.operator, other)(this, other)
 
     assert False
 
 
 def get_variables(clause):
     variables = set()
-    if isinstance(clause.this, Variable):
-        variables.add(clause.this)
-    if isinstance(clause.other, Variable):
-        variables.add(clause.other)
-    if isinstance(clause.this, Clause):
-        variables |= get_variables(clause.this)
-    if isinstance(clause.other, Clause):
-        variables |= get_variables(clause.other)
+    stack = [clause]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Variable):
+            variables.add(node)
+        elif isinstance(node, Application):
+            stack.extend(node.args)
+        elif isinstance(node, LinearTerm):
+            variables.update(node.variables)
+        elif isinstance(node, Clause):
+            stack.append(node.this)
+            stack.append(node.other)
     return variables
 
 
-def join_formula(clauses):
+def join_formula(clauses, cache=None):
     assert clauses
-    if len(clauses) == 1:
-        return convert_to_pysmt_formula(clauses[0])
-    return And(convert_to_pysmt_formula(clauses[0]), join_formula(clauses[1:]))
-
-
-def convert_to_pysmt_model():
-    variables = []
-    if hasattr(Variable, "instances"):
-        variables += Variable.instances
-    if hasattr(BitVec, "instances"):
-        variables += BitVec.instances
-    clauses = []
-    for variable in variables:
-        clauses += variable.clauses
-    if hasattr(Function_, "instances"):
-        for instance in Function_.instances:
-            clauses += instance.clauses
-    if len(clauses) == 1:
-        return get_model(convert_to_pysmt_formula(clauses[0]))
-    f = join_formula(clauses)
-    return get_model(f)
+    return And([convert_to_pysmt_formula(clause, cache) for clause in clauses])
+
+
+def _iter_clauses():
+    registries = current_context().registries()
+    functions = [
+        instance
+        for cls, instances in registries
+        if issubclass(cls, Function_)
+        for instance in list(instances)
+    ]
+    # Building a body registers it on its variable, so do that first
+    function_clauses = [clause for instance in functions for clause in instance.clauses]
+    for cls, instances in registries:
+        if issubclass(cls, Variable):
+            for variable in list(instances):
+                yield from variable.clauses
+    for clause in function_clauses:
+        owner = clause._find_variable()
+        if not owner._clauses or id(clause) not in owner._clauses:
+            yield clause
+
+
+def _collect_clauses():
+    return list(_iter_clauses())
+
+
+def build_formula(cache=None):
+    return join_formula(_collect_clauses(), cache)
+
+
+def _solve_formula(f, profile=NULL_STATS):
+    # As pysmt's get_model, with solver start up and solving timed apart
+    env = get_env()
+    with profile.phase("solver_start"):
+        logic = get_logic(f, env)
+        solver = env.factory.Solver(logic=logic, generate_models=True, incremental=False)
+    try:
+        with profile.phase("solve"):
+            solver.add_assertion(f)
+            if not solver.solve():
+                return None
+            return solver.get_model()
+    finally:
+        solver.exit()
+
+
+def _convert_clauses(clauses, cache, profile):
+    if cache is not None:
+        hits, misses = cache.hits, cache.misses
+    with profile.phase("convert"):
+        f = join_formula(clauses, cache)
+    if profile.enabled:
+        if cache is not None:
+            profile.count("cache_hits", cache.hits - hits)
+            profile.count("cache_misses", cache.misses - misses)
+        profile.count("nodes", _dag_size(f))
+    return f
+
+
+def solve_clauses(clauses, cache=None, simplify_stats=None, profile=NULL_STATS):
+    with pysmt_lock:
+        f = _convert_clauses(clauses, cache, profile)
+        query = f
+        if simplify_stats is not None:
+            from .simplify import simplify
+
+            with profile.phase("simplify"):
+                query = simplify(f, simplify_stats)
+        model = _solve_formula(query, profile)
+        with profile.phase("complete"):
+            return _complete_model(model, f)
+
+
+def convert_to_pysmt_model(cache=None):
+    if cache is None:
+        cache = ConversionCache()
+    return solve_clauses(_collect_clauses(), cache)
+
+
+def _complete_model(model, f):
+    if model is None:
+        return None
+    assignment = dict(model)
+    missing = f.get_free_variables().difference(assignment)
+    if not missing:
+        return model
+    # Solvers may leave out symbols which are irrelevant to satisfiability
+    for symbol in sorted(missing, key=lambda x: x.symbol_name()):
+        if not symbol.symbol_type().is_function_type():
+            assignment[symbol] = model.get_value(symbol)
+    return EagerModel(assignment)
+
+
+def _returns_bool(clause):
+    if isinstance(clause, Application):
+        return clause.this._returns_bool()
+    if isinstance(clause, LinearTerm):
+        return False
+    if clause.operator in [
+        operator.eq,
+        operator.ne,
+        operator.lt,
+        operator.le,
+        operator.gt,
+        operator.ge,
+    ]:
+        return True
+    if clause.operator in [operator.and_, operator.or_, operator.invert, operator.xor]:
+        return _derive_py_type(clause) is bool and not any(
+            isinstance(variable, BitVec) for variable in get_variables(clause)
+        )
+    return False
+
+
+def _detach_terms(args: tuple):
+    # Terms built for get-value are not assertions. Clauses behind the cached
+    # model are, and a boolean clause may be a statement made before the
+    # query, so only other terms are detached
+    last = current_context()._last_model
+    solved = set() if last is None else {id(clause) for clause in last[0]}
+    for arg in args:
+        if not isinstance(arg, Clause) or id(arg) in solved or _returns_bool(arg):
+            continue
+        arg._find_variable()._remove_sub_clause(arg)
+
+
+def evaluate(model, args: tuple):
+    if model is None:
+        return {}
+    if not args:
+        return dict(model)
+    values = {}
+    with pysmt_lock:
+        for arg in args:
+            if isinstance(arg, Variable):
+                term = arg._symbol
+                if term is None:
+                    continue
+            else:
+                term = convert_to_pysmt_formula(arg)
+            values[term] = model.get_value(term)
+    return values
 
 
 def get_values(args: tuple):
-    model = convert_to_pysmt_model()
-    try:
-        return dict(model)
-    except TypeError:
-        return {}
+    _detach_terms(args)
+    return evaluate(current_context().get_model(), args)
+
+
+def _term_str(term):
+    if term.is_symbol():
+        return term.symbol_name()
+    # Terms are echoed in full, as SMT-LIB get-value does
+    return term.serialize()
 
 
 def get_value_str(args: tuple):
@@ -214,16 +714,17 @@ def get_value_str(args: tuple):
     if not values:
         return ""
     s = []
-    symbols = sorted(values.keys(), key=lambda x: x._content)
-    for symbol in symbols:
-        value = values[symbol]
+    with pysmt_lock:
+        terms = sorted(((_term_str(term), term) for term in values), key=lambda x: x[0])
+    for name, term in terms:
+        value = values[term]
         if value._content.node_type == op.BV_CONSTANT:
             # See https://github.com/pysmt/pysmt/issues/548
             padding = 10
             res = "#" + f"{value.constant_value():#0{padding}x}"[1:]
-            s.append(f"({symbol.symbol_name()} {res})")
+            s.append(f"({name} {res})")
         else:
-            s.append(f"({symbol.symbol_name()} {value})")
+            s.append(f"({name} {value})")
     if len(s) == 1:
         return f"({s[0]})"
     return "(" + "\n ".join(s) + ")"
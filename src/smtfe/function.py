@@ -1,32 +1,127 @@
-from .variable import InstanceRegistry, function_, Clause
+import operator
+
+from .context import Context
+from .variable import InstanceRegistry, function_, Clause, Variable
+
+
+def call_():
+    pass
+
+
+_bool_operators = {
+    operator.and_,
+    operator.or_,
+    operator.invert,
+    operator.eq,
+    operator.ne,
+    operator.lt,
+    operator.le,
+    operator.gt,
+    operator.ge,
+}
 
 
 class Function(Clause, InstanceRegistry):
     def __init__(self, name, func):
+        import inspect
+
         self.name = name
         self._symbol = None
         self.operator = function_
         self.other = None
+        self._variable = None
         self.func = func
         self._clauses = None
+        self._free_variables = None
+        self.parameters = tuple(inspect.signature(func).parameters)
+        # Instantiated bodies keyed by the pysmt types of the arguments
+        self._definitions = {}
+        self._template = None
 
     @staticmethod
     def wrap(func):
         rv = Function(func.__name__, func)
         return rv
 
-    def __call__(self):
-        self.clauses
-        return self
+    def __call__(self, *args):
+        if len(args) != len(self.parameters):
+            raise TypeError(
+                f"{self.name}() takes {len(self.parameters)} arguments ({len(args)} given)"
+            )
+        if not args:
+            self.clauses
+            return self
+        application = Application(self, args)
+        for arg in args:
+            if isinstance(arg, Clause):
+                arg._find_variable()._remove_sub_clause(arg)
+        application._variable._add_clause(application)
+        return application
 
     @property
     def clauses(self):
+        if self.parameters:
+            return []
         if self._clauses is None:
             self._clauses = [self.func()]
         return self._clauses
 
     @property
     def this(self):
+        if self.parameters:
+            return None
         if self._clauses is None:
             self._clauses = [self.func()]
         return self._clauses[0]
+
+    def _instantiate(self, make_parameter):
+        # Bodies are built in a private context so their clauses are never
+        # collected as assertions of their own. A body over a variable from
+        # outside, such as a closure, is attached to that variable instead
+        # and must be detached from it
+        with Context(keep_alive=True) as context:
+            params = [make_parameter(index, name) for index, name in enumerate(self.parameters)]
+            body = self.func(*params)
+        if isinstance(body, Clause):
+            owner = body._find_variable()
+            if all(instance is not owner for instance in context._alive):
+                owner._remove_sub_clause(body)
+        return params, body
+
+    def _parameters_template(self):
+        if self._template is None:
+            self._template = self._instantiate(
+                lambda index, name: Variable(f"{self.name}.{name}")
+            )
+        return self._template[0]
+
+    def _body_template(self):
+        self._parameters_template()
+        return self._template[1]
+
+    def _returns_bool(self):
+        body = self._body_template()
+        return isinstance(body, Clause) and body.operator in _bool_operators
+
+
+class Application(Clause):
+    __slots__ = ("args",)
+
+    def __init__(self, function, args):
+        self.this = function
+        self.operator = call_
+        self.other = None
+        self.args = args
+        self._variable = None
+        for arg in args:
+            if isinstance(arg, Variable):
+                self._variable = arg
+                break
+            if isinstance(arg, Clause):
+                self._variable = arg._find_variable()
+                break
+        if self._variable is None:
+            raise TypeError(f"{function.name}() needs at least one Variable argument")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.this.name}, {self.args})"
@@ -0,0 +1,87 @@
+import operator
+
+from .variable import Clause
+
+
+def dot_():
+    pass
+
+
+class LinearTerm(Clause):
+    __slots__ = ("coefficients", "variables")
+
+    def __init__(self, coefficients, variables, owner):
+        self.this = None
+        self.operator = dot_
+        self.other = None
+        self.coefficients = coefficients
+        self.variables = variables
+        self._variable = owner
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.coefficients}, {self.variables})"
+
+
+def _require_numpy():
+    # Imported on first use so that converting and solving never load numpy
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        raise ImportError("numpy is required for bulk constraint construction") from None
+    return numpy
+
+
+def terms(A, x):
+    numpy = _require_numpy()
+    A = numpy.asarray(A)
+    if A.ndim != 2 or A.shape[1] != len(x):
+        raise ValueError(f"coefficients of shape {A.shape} do not match {len(x)} variables")
+    if not numpy.issubdtype(A.dtype, numpy.integer):
+        raise TypeError(f"coefficients must be integers, not {A.dtype}")
+    x = numpy.asarray(x, dtype=object)
+    # Locate the non-zero entries of every row at once, then split per row
+    rows, columns = numpy.nonzero(A)
+    coefficients = A[rows, columns].tolist()
+    variables = x[columns].tolist()
+    ends = numpy.searchsorted(rows, numpy.arange(1, A.shape[0] + 1)).tolist()
+    owner = x[0] if len(x) else None
+    rv = []
+    start = 0
+    for end in ends:
+        row_variables = variables[start:end]
+        rv.append(
+            LinearTerm(
+                coefficients[start:end],
+                row_variables,
+                row_variables[0] if row_variables else owner,
+            )
+        )
+        start = end
+    return rv
+
+
+def constraints(A, x, b, op=operator.le):
+    numpy = _require_numpy()
+    rows = terms(A, x)
+    b = numpy.broadcast_to(numpy.asarray(b), (len(rows),)).tolist()
+    rv = []
+    for term, bound in zip(rows, b):
+        clause = Clause(term, op, bound)
+        clause._variable = term._variable
+        term._variable._add_clause(clause)
+        rv.append(clause)
+    return rv
+
+
+def bounds(x, lo=None, hi=None):
+    numpy = _require_numpy()
+    rv = []
+    for op, limit in ((operator.ge, lo), (operator.le, hi)):
+        if limit is None:
+            continue
+        limit = numpy.broadcast_to(numpy.asarray(limit), (len(x),)).tolist()
+        for variable, value in zip(x, limit):
+            clause = Clause(variable, op, value)
+            variable._add_clause(clause)
+            rv.append(clause)
+    return rv
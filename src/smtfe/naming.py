@@ -0,0 +1,26 @@
+import itertools
+import string
+
+
+class CounterNaming:
+    def __init__(self, prefix="v!"):
+        self.prefix = prefix
+        self._counter = itertools.count()
+
+    def __call__(self):
+        return f"{self.prefix}{next(self._counter)}"
+
+
+class UuidNaming:
+    def __init__(self):
+        import shortuuid
+
+        self._uuid = shortuuid.ShortUUID(alphabet=string.ascii_letters).uuid
+
+    def __call__(self):
+        return self._uuid()
+
+
+# Shared by every context which does not choose its own strategy, so that
+# names stay unique among the symbols pysmt holds for the whole process
+default_naming = CounterNaming()
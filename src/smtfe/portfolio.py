@@ -0,0 +1,105 @@
+import multiprocessing
+import queue
+import time
+
+from pysmt.shortcuts import Solver, get_env
+from pysmt.solvers.eager import EagerModel
+
+from .convert import _constant, build_formula, pysmt_lock
+from .utils import emit_smt2, get_formula
+
+
+_POLL_INTERVAL = 0.05
+
+
+class Cancelled(Exception):
+    pass
+
+
+def _solve_script(script, name=None):
+    f = get_formula(script)
+    with Solver(name=name, generate_models=True) as solver:
+        solver.add_assertion(f)
+        if not solver.solve():
+            return None
+        model = solver.get_model()
+        return {
+            symbol.symbol_name(): model.get_value(symbol).constant_value()
+            for symbol in f.get_free_variables()
+            if not symbol.symbol_type().is_function_type()
+        }
+
+
+def _solve(name, script, results):
+    try:
+        results.put((name, _solve_script(script, name), None))
+    except Exception as e:
+        results.put((name, None, repr(e)))
+
+
+def _to_model(f, values):
+    if values is None:
+        return None
+    assignment = {}
+    with pysmt_lock:
+        for symbol in f.get_free_variables():
+            if symbol.symbol_name() in values:
+                value = values[symbol.symbol_name()]
+                assignment[symbol] = _constant(symbol.symbol_type(), value)
+    return EagerModel(assignment)
+
+
+def solve(f, solvers=None, timeout=None, cancel=None, script=None):
+    if solvers is None:
+        solvers = sorted(get_env().factory.all_solvers())
+    if not solvers:
+        raise ValueError("No solvers available")
+    if script is None:
+        with pysmt_lock:
+            script = emit_smt2(f)
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    processes = [
+        context.Process(target=_solve, args=(name, script, results), daemon=True)
+        for name in solvers
+    ]
+    # Forked children inherit pysmt's walkers, so never fork in mid-walk
+    with pysmt_lock:
+        for process in processes:
+            process.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    errors = []
+    try:
+        while len(errors) < len(processes):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            wait = None
+            if deadline is not None:
+                wait = max(deadline - time.monotonic(), 0)
+            if cancel is not None:
+                wait = _POLL_INTERVAL if wait is None else min(wait, _POLL_INTERVAL)
+            try:
+                name, values, error = results.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"No solver finished within {timeout}s")
+                continue
+            if error is not None:
+                errors.append(f"{name}: {error}")
+                continue
+            return name, _to_model(f, values)
+        raise RuntimeError("All solvers failed: " + "; ".join(errors))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        results.close()
+
+
+def get_model(solvers=None, timeout=None):
+    return solve(build_formula(), solvers, timeout)[1]
+
+
+def check_sat(solvers=None, timeout=None):
+    return get_model(solvers, timeout) is not None
@@ -0,0 +1,129 @@
+from pysmt.shortcuts import Solver
+
+from .context import current_context
+from .convert import (
+    ConversionCache,
+    _collect_clauses,
+    convert_to_pysmt_formula,
+    pysmt_lock,
+)
+from .function import Function
+
+
+class Session:
+    def __init__(self, name=None, logic=None, context=None):
+        self.context = context if context is not None else current_context()
+        with pysmt_lock:
+            self.solver = Solver(
+                name=name, logic=logic, generate_models=True, incremental=True
+            )
+        self.cache = ConversionCache()
+        self._asserted = {}
+        self._scopes = [[]]
+        # Clauses of outer scopes consumed by each scope, by level
+        self._consumed = [[]]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        with pysmt_lock:
+            self.solver.exit()
+
+    def _pending(self):
+        with self.context:
+            clauses = _collect_clauses()
+        return [clause for clause in clauses if id(clause) not in self._asserted]
+
+    def _retract(self, clause):
+        self.cache.discard(clause)
+        if isinstance(clause, Function):
+            return
+        clause._find_variable()._remove_sub_clause(clause)
+
+    def _rebuild(self, current):
+        # Asserted clauses consumed into larger expressions cannot be retracted
+        # one by one, so every scope is asserted again without them
+        self.solver.reset_assertions()
+        top = len(self._scopes) - 1
+        for level, scope in enumerate(self._scopes):
+            if level:
+                self.solver.push()
+            kept = []
+            for clause in scope:
+                if id(clause) in current:
+                    kept.append(clause)
+                elif level < top:
+                    self._consumed[-1].append((level, clause))
+            scope[:] = kept
+            for clause in scope:
+                self.solver.add_assertion(convert_to_pysmt_formula(clause, self.cache))
+        self._asserted = {id(clause): clause for scope in self._scopes for clause in scope}
+
+    def sync(self):
+        with self.context:
+            clauses = _collect_clauses()
+        current = {id(clause) for clause in clauses}
+        with pysmt_lock:
+            if any(key not in current for key in self._asserted):
+                self._rebuild(current)
+            pending = [clause for clause in clauses if id(clause) not in self._asserted]
+            for clause in pending:
+                if id(clause) in self._asserted:
+                    continue
+                f = convert_to_pysmt_formula(clause, self.cache)
+                self.solver.add_assertion(f)
+                self._asserted[id(clause)] = clause
+                self._scopes[-1].append(clause)
+        return len(pending)
+
+    def push(self):
+        self.sync()
+        with pysmt_lock:
+            self.solver.push()
+        self._scopes.append([])
+        self._consumed.append([])
+
+    def pop(self):
+        if len(self._scopes) == 1:
+            raise IndexError("pop from empty scope stack")
+        with self.context:
+            current = {id(clause) for clause in _collect_clauses()}
+        consumed = self._consumed.pop()
+        # Outer clauses consumed since the last sync are still asserted
+        unsynced = [
+            clause
+            for scope in self._scopes[:-1]
+            for clause in scope
+            if id(clause) not in current
+        ]
+        for clause in self._pending():
+            self._retract(clause)
+        for clause in self._scopes.pop():
+            del self._asserted[id(clause)]
+            self._retract(clause)
+        for clause in unsynced:
+            clause._find_variable()._add_clause(clause)
+        for level, clause in consumed:
+            clause._find_variable()._add_clause(clause)
+            self._scopes[level].append(clause)
+            self._asserted[id(clause)] = clause
+        with pysmt_lock:
+            if consumed:
+                self._rebuild(self._asserted)
+            else:
+                self.solver.pop()
+
+    def check_sat(self):
+        self.sync()
+        with pysmt_lock:
+            return self.solver.solve()
+
+    def get_model(self):
+        with pysmt_lock:
+            if not self.check_sat():
+                return None
+            return self.solver.get_model()
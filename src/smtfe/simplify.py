@@ -0,0 +1,39 @@
+from .convert import pysmt_lock
+from .stats import _dag_size
+
+
+def _conjuncts(f):
+    return len(f.args()) if f.is_and() else 1
+
+
+class SimplifyStats:
+    def __init__(self):
+        self.nodes_before = 0
+        self.nodes_after = 0
+        self.conjuncts_before = 0
+        self.conjuncts_after = 0
+
+    def __repr__(self):
+        return (
+            f"SimplifyStats(nodes={self.nodes_before}->{self.nodes_after}, "
+            f"conjuncts={self.conjuncts_before}->{self.conjuncts_after})"
+        )
+
+    @property
+    def ratio(self):
+        if not self.nodes_before:
+            return 1.0
+        return self.nodes_after / self.nodes_before
+
+
+def simplify(f, stats=None):
+    # pysmt folds constants, removes double negations and flattens and
+    # deduplicates nested conjunctions and disjunctions
+    with pysmt_lock:
+        simplified = f.simplify()
+        if stats is not None:
+            stats.nodes_before += _dag_size(f)
+            stats.nodes_after += _dag_size(simplified)
+            stats.conjuncts_before += _conjuncts(f)
+            stats.conjuncts_after += _conjuncts(simplified)
+    return simplified
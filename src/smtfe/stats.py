@@ -0,0 +1,57 @@
+import contextlib
+import time
+
+
+def _dag_size(f):
+    seen = set()
+    stack = [f]
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.extend(node.args())
+    return len(seen)
+
+
+class SolveStats:
+    enabled = True
+
+    def __init__(self):
+        self.phases = {}
+        self.counts = {}
+
+    def __repr__(self):
+        return f"SolveStats({self.as_dict()})"
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def count(self, name, value=1):
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def as_dict(self):
+        rv = {f"{name}_seconds": elapsed for name, elapsed in self.phases.items()}
+        rv.update(self.counts)
+        return rv
+
+
+class _NullStats:
+    enabled = False
+
+    _phase = contextlib.nullcontext()
+
+    def phase(self, name):
+        return self._phase
+
+    def count(self, name, value=1):
+        pass
+
+
+NULL_STATS = _NullStats()
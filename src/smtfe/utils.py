@@ -1,7 +1,63 @@
+import codecs
+import functools
 import io
+import mmap
+import operator
 
+import pysmt.operators as op
+import pysmt.smtlib.commands as smtcmd
+
+from pysmt.shortcuts import FreshSymbol
 from pysmt.smtlib.parser.parser import SmtLibParser
-from pysmt.smtlib.script import smtlibscript_from_formula
+from pysmt.smtlib.script import SmtLibCommand, smtlibscript_from_formula
+from pysmt.typing import BOOL
+
+from .bitvec import BitVec
+from .convert import ConversionCache, _iter_clauses, convert_to_pysmt_formula, pysmt_lock
+from .variable import Clause, Variable
+
+_smt_operator_mapping = {
+    op.AND: operator.and_,
+    op.OR: operator.or_,
+    op.IFF: operator.eq,
+    op.EQUALS: operator.eq,
+    op.LT: operator.lt,
+    op.LE: operator.le,
+    op.PLUS: operator.add,
+    op.MINUS: operator.sub,
+    op.TIMES: operator.mul,
+    op.IMPLIES: lambda this, other: _negate(this) | other,
+    op.BV_ADD: operator.add,
+    op.BV_SUB: operator.sub,
+    op.BV_MUL: operator.mul,
+    op.BV_UDIV: operator.floordiv,
+    op.BV_UREM: operator.mod,
+    op.BV_AND: operator.and_,
+    op.BV_OR: operator.or_,
+    op.BV_XOR: operator.xor,
+    op.BV_LSHL: operator.lshift,
+    op.BV_LSHR: operator.rshift,
+    op.BV_ULT: operator.lt,
+    op.BV_ULE: operator.le,
+    op.BV_CONCAT: lambda this, other: this.concat(other),
+}
+
+
+class _DecodedReader:
+    def __init__(self, raw):
+        self._raw = raw
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def read(self, size=-1):
+        while True:
+            data = self._raw.read(size)
+            text = self._decoder.decode(data, final=not data)
+            if text or not data:
+                return text
+
+    def __iter__(self):
+        for line in iter(self._raw.readline, b""):
+            yield self._decoder.decode(line)
 
 
 def emit_smt2(f):
@@ -11,7 +67,151 @@ def emit_smt2(f):
     return fh.getvalue()
 
 
+def write_smt2(fh, logic=None):
+    if logic is not None:
+        SmtLibCommand(smtcmd.SET_LOGIC, [logic]).serialize(fh)
+        fh.write("\n")
+    declared = set()
+    definitions = {}
+    cache = ConversionCache(inline_functions=False)
+
+    def declare(f, bound=()):
+        for symbol in sorted(f.get_free_variables(), key=lambda x: x.symbol_name()):
+            if symbol in declared or symbol in bound:
+                continue
+            declared.add(symbol)
+            definition = definitions.get(symbol)
+            if definition is None:
+                SmtLibCommand(smtcmd.DECLARE_FUN, [symbol]).serialize(fh)
+            else:
+                params, body = definition
+                declare(body, params)
+                SmtLibCommand(
+                    smtcmd.DEFINE_FUN,
+                    [symbol.symbol_name(), params, body.get_type(), body],
+                ).serialize(fh)
+            fh.write("\n")
+
+    for clause in _iter_clauses():
+        # The lock is taken per clause as pysmt's walkers are not thread safe,
+        # without holding other threads off for the whole file
+        with pysmt_lock:
+            f = convert_to_pysmt_formula(clause, cache)
+            definitions.update(cache.definitions)
+            # Only the definitions outlive a clause, keeping memory bounded
+            cache.clear()
+            declare(f)
+            SmtLibCommand(smtcmd.ASSERT, [f]).serialize(fh)
+            fh.write("\n")
+    SmtLibCommand(smtcmd.CHECK_SAT, []).serialize(fh)
+    fh.write("\n")
+
+
 def get_formula(s):
     fh = io.StringIO(s)
     script = SmtLibParser().get_script(fh)
     return script.get_strict_formula()
+
+
+def _declare(symbol):
+    symbol_type = symbol.symbol_type()
+    if symbol_type.is_bv_type():
+        variable = BitVec(symbol.symbol_name(), symbol_type.width)
+    elif symbol_type.is_bool_type() or symbol_type.is_int_type():
+        variable = Variable(symbol.symbol_name())
+    else:
+        raise NotImplementedError(f"Unsupported declaration type {symbol_type}")
+    variable._symbol = symbol
+    return variable
+
+
+def _negate(arg):
+    if isinstance(arg, (Clause, Variable)):
+        return ~arg
+    return not arg
+
+
+def _ite(f, condition, then, otherwise):
+    # A fresh variable stands for the term, defined by a clause per branch
+    with pysmt_lock:
+        variable = _declare(FreshSymbol(f.get_type(), template="ite!%d"))
+    _negate(condition) | (variable == then)
+    condition | (variable == otherwise)
+    return variable
+
+
+def _contradiction():
+    with pysmt_lock:
+        variable = _declare(FreshSymbol(BOOL, template="false!%d"))
+    return (variable & ~variable) == True  # noqa: E712
+
+
+def _apply_smt_operator(f, args):
+    node_type = f.node_type()
+    if node_type == op.NOT:
+        (arg,) = args
+        return _negate(arg)
+    if node_type in (op.BV_NOT, op.BV_NEG):
+        (arg,) = args
+        if isinstance(arg, (Clause, Variable)):
+            return ~arg if node_type == op.BV_NOT else 0 - arg
+        value = ~arg if node_type == op.BV_NOT else -arg
+        return value % (1 << f.bv_width())
+    if node_type == op.BV_EXTRACT:
+        (arg,) = args
+        return arg.extract(f.bv_extract_end(), f.bv_extract_start())
+    if node_type == op.ITE:
+        return _ite(f, *args)
+    if node_type not in _smt_operator_mapping:
+        raise NotImplementedError(f"Unsupported operator {op.op_to_str(node_type)}")
+    return functools.reduce(_smt_operator_mapping[node_type], args)
+
+
+def _to_clause(f, variables):
+    results = []
+    stack = [(f, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node.is_symbol():
+            results.append(variables[node.symbol_name()])
+        elif node.is_constant():
+            results.append(node.constant_value())
+        elif not expanded:
+            stack.append((node, True))
+            stack.extend((arg, False) for arg in reversed(node.args()))
+        else:
+            start = len(results) - len(node.args())
+            args = results[start:]
+            del results[start:]
+            results.append(_apply_smt_operator(node, args))
+    return results[0]
+
+
+def iter_smt2(source):
+    if isinstance(source, (mmap.mmap, io.RawIOBase, io.BufferedIOBase)):
+        source = _DecodedReader(source)
+    variables = {}
+    for cmd in SmtLibParser().get_command_generator(source):
+        if cmd.name in (smtcmd.DECLARE_FUN, smtcmd.DECLARE_CONST):
+            symbol = cmd.args[0]
+            variable = _declare(symbol)
+            variables[symbol.symbol_name()] = variable
+            yield cmd.name, variable
+        elif cmd.name == smtcmd.ASSERT:
+            clause = _to_clause(cmd.args[0], variables)
+            if isinstance(clause, Variable):
+                clause = clause == True  # noqa: E712
+            elif not isinstance(clause, Clause):
+                # Assertions which fold to a constant have nothing to own them
+                clause = None if clause else _contradiction()
+            yield cmd.name, clause
+        else:
+            yield cmd.name, None
+
+
+def load_smt2(source):
+    variables = {}
+    for name, result in iter_smt2(source):
+        if name in (smtcmd.DECLARE_FUN, smtcmd.DECLARE_CONST):
+            variables[result.name] = result
+    return variables
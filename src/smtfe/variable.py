@@ -1,65 +1,122 @@
 import functools
 import operator
-import string
 import sys
 
-from weakref import WeakSet
+from weakref import WeakValueDictionary
 
-import shortuuid
+from .context import current_context
 
 PY35 = sys.version_info >= (3, 5)
 
-shortuuid.set_alphabet(string.ascii_letters)
-
 
 def function_():
     pass
 
 
+_commutative_operators = {
+    operator.add,
+    operator.mul,
+    operator.and_,
+    operator.or_,
+    operator.xor,
+    operator.eq,
+    operator.ne,
+}
+
+
+def set_hash_consing(enabled=True):
+    current_context().cons_table = WeakValueDictionary() if enabled else None
+
+
+def _cons_key(value):
+    if isinstance(value, (Clause, Variable)):
+        return id(value)
+    return (type(value), value)
+
+
+def _make_clause(this, operator, other):
+    cons_table = current_context().cons_table
+    if cons_table is None:
+        return Clause(this, operator, other)
+    try:
+        key = (operator, _cons_key(this), _cons_key(other))
+        clause = cons_table.get(key)
+    except TypeError:
+        return Clause(this, operator, other)
+    if clause is None:
+        clause = Clause(this, operator, other)
+        cons_table[key] = clause
+    return clause
+
+
 class Clause:
+    __slots__ = ("this", "operator", "other", "_variable", "__weakref__")
+
     def __init__(self, this, operator, other=None):
         assert not isinstance(other, tuple)
         assert not isinstance(this, tuple)
         self.this = this
         self.operator = operator
         self.other = other
+        self._variable = this if isinstance(this, Variable) else None
 
     def _find_variable(self):
-        if isinstance(self.this, Variable):
-            return self.this
-        return self.this._find_variable()
+        if self._variable is not None:
+            return self._variable
+        path = []
+        node = self
+        while node._variable is None and not isinstance(node.this, Variable):
+            path.append(node)
+            node = node.this
+        variable = node._variable
+        if variable is None:
+            variable = node._variable = node.this
+        for node in path:
+            node._variable = variable
+        return variable
 
     def apply(self, operator, other):
         var = self._find_variable()
         var._remove_sub_clause(self)
-        clause = Clause(self, operator, other)
+        clause = _make_clause(self, operator, other)
+        clause._variable = var
         if isinstance(other, Clause):
-            var._remove_sub_clause(other)
-            if isinstance(other.this, Variable):
-                other.this._remove_sub_clause(other)
-        var.clauses.append(clause)
+            other._find_variable()._remove_sub_clause(other)
+        var._add_clause(clause)
         return clause
 
-    apply_right = apply
+    def apply_right(self, operator, other):
+        if other is None or operator in _commutative_operators:
+            return self.apply(operator, other)
+        var = self._find_variable()
+        var._remove_sub_clause(self)
+        clause = _make_clause(other, operator, self)
+        clause._variable = var
+        var._add_clause(clause)
+        return clause
 
     def __repr__(self):
         return f"{self.__class__.__name__}({str(self.this)}, {self.operator}, {str(self.other)})"
 
 
+class _ContextInstances:
+    def __get__(self, instance, cls):
+        return current_context().instances(cls)
+
+
 class InstanceRegistry:
+    __slots__ = ()
+
+    instances = _ContextInstances()
+
     def __new__(cls, *args, **kwargs):
         instance = object.__new__(cls)
-        if "instances" not in cls.__dict__:
-            cls.instances = WeakSet()
-        cls.instances.add(instance)
+        current_context().register(instance)
         return instance
 
     @classmethod
     def reset(cls):
-        if "instances" in cls.__dict__:
-            for instance in cls.instances:
-                del instance
-        cls.instances = WeakSet()
+        current_context().instances(cls).clear()
 
 
 def left_op(operator, comparison=False, identity=None):
@@ -79,33 +136,68 @@ def right_op(operator):
 
 
 class Variable(InstanceRegistry):
+    __slots__ = ("name", "_clauses", "_clause_refs", "_symbol", "__weakref__")
+
     def __init__(self, name=None):
-        self.clauses = []
+        self._clauses = None
+        self._clause_refs = None
         self._symbol = None
         if name:
             self.name = name
         else:
-            self.name = shortuuid.uuid()
+            self.name = current_context().naming()
 
     def __repr__(self):
         return f"Variable({id(self)})"
 
+    @property
+    def clauses(self):
+        if not self._clauses:
+            return []
+        return list(self._clauses.values())
+
+    def _add_clause(self, clause: Clause):
+        if self._clauses is None:
+            self._clauses = {}
+        key = id(clause)
+        if key in self._clauses:
+            # A hash-consed clause may be produced by several statements
+            if self._clause_refs is None:
+                self._clause_refs = {}
+            self._clause_refs[key] = self._clause_refs.get(key, 1) + 1
+        else:
+            self._clauses[key] = clause
+
     def _remove_sub_clause(self, sub_clause: Clause):
-        self.clauses = [
-            clause for clause in list(self.clauses) if repr(clause) != repr(sub_clause)
-        ]
+        if not self._clauses:
+            return
+        key = id(sub_clause)
+        if self._clause_refs and key in self._clause_refs:
+            refs = self._clause_refs[key] - 1
+            if refs == 1:
+                del self._clause_refs[key]
+            else:
+                self._clause_refs[key] = refs
+            return
+        self._clauses.pop(key, None)
 
     def apply(self, operator, other):
-        clause = Clause(self, operator, other)
+        clause = _make_clause(self, operator, other)
         if isinstance(other, Clause):
             self._remove_sub_clause(other)
-            if isinstance(other, Clause):
-                var = other._find_variable()
-                var._remove_sub_clause(other)
-        self.clauses.append(clause)
+            var = other._find_variable()
+            var._remove_sub_clause(other)
+        self._add_clause(clause)
         return clause
 
-    apply_right = apply
+    def apply_right(self, operator, other):
+        if other is None or operator in _commutative_operators:
+            return self.apply(operator, other)
+        # Reflected operands keep their order, with this variable as owner
+        clause = _make_clause(other, operator, self)
+        clause._variable = self
+        self._add_clause(clause)
+        return clause
 
 
 setattr(Variable, "__add__", left_op(operator.add))
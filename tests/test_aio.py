@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import time
+import unittest
+from functools import reduce
+
+from pysmt.shortcuts import Int
+
+from smtfe import Context, Variable, aio, reset
+
+
+def bounded(low, high):
+    a = Variable()
+    a > low
+    a < high
+    return a
+
+
+def chain(start, length):
+    variables = [Variable() for _ in range(length)]
+    variables[0] == start
+    for previous, variable in zip(variables, variables[1:]):
+        variable == previous + 1
+        variable > previous
+    return variables[-1]
+
+
+def pigeonhole(holes):
+    # Unsatisfiable, and slow for a CDCL solver to refute
+    pigeons = [[Variable() for _ in range(holes)] for _ in range(holes + 1)]
+    for row in pigeons:
+        reduce(lambda a, b: a | b, row) == True  # noqa: E712
+    for hole in range(holes):
+        for i, row in enumerate(pigeons):
+            for other in pigeons[i + 1:]:
+                ~(row[hole] & other[hole]) == True  # noqa: E712
+    return pigeons
+
+
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_get_model(self):
+        a = bounded(2, 4)
+        model = asyncio.run(aio.get_model())
+        self.assertEqual(model.get_py_value(a._symbol), 3)
+        self.assertTrue(asyncio.run(aio.check_sat()))
+
+    def test_unsat(self):
+        a = Variable()
+        a * 2 == 7
+        self.assertFalse(asyncio.run(aio.check_sat()))
+        self.assertEqual(asyncio.run(aio.get_value((a,))), {})
+
+    def test_get_value(self):
+        a = bounded(2, 4)
+        values = asyncio.run(aio.get_value((a,)))
+        self.assertEqual(values, {a._symbol: Int(3)})
+
+    def test_concurrent_tasks(self):
+        async def task(i):
+            model = await aio.solve(lambda: bounded(i, i + 2))
+            ((symbol, value),) = dict(model).items()
+            return value.constant_value()
+
+        async def main():
+            return await asyncio.gather(*[task(i) for i in range(6)])
+
+        self.assertEqual(asyncio.run(main()), [i + 1 for i in range(6)])
+        self.assertEqual(len(Variable.instances), 0)
+
+    def test_concurrent_large(self):
+        async def task(i):
+            last = []
+            model = await aio.solve(lambda: last.append(chain(i, 400)))
+            return model.get_py_value(last[0]._symbol)
+
+        async def main():
+            return await asyncio.gather(*[task(i) for i in range(12)])
+
+        self.assertEqual(asyncio.run(main()), [i + 399 for i in range(12)])
+
+    def test_timeout(self):
+        with Context():
+            pigeons = pigeonhole(12)  # noqa: F841
+            start = time.monotonic()
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(aio.get_model(timeout=1))
+            self.assertLess(time.monotonic() - start, 10)
+        deadline = time.monotonic() + 5
+        while multiprocessing.active_children() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(multiprocessing.active_children(), [])
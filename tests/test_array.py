@@ -0,0 +1,105 @@
+import tempfile
+import unittest
+
+from smtfe import Array, BitVec, Context, Variable, reset
+from smtfe.cache import ResultCache
+from smtfe.convert import convert_to_pysmt_formula, convert_to_pysmt_model
+
+
+class TestArray(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_lazy_elements(self):
+        memory = Array(size=65536, bits=8)
+        self.assertEqual(len(memory), 65536)
+        self.assertEqual(memory.touched(), {})
+
+        first = memory[0]
+        self.assertIsInstance(first, BitVec)
+        self.assertEqual(first.bits, 8)
+        self.assertIs(memory[0], first)
+        self.assertIs(memory[-1], memory[65535])
+        self.assertEqual(list(memory.touched()), [0, 65535])
+        self.assertEqual(first.name, f"{memory.name}_0")
+
+        with self.assertRaises(IndexError):
+            memory[65536]
+        with self.assertRaises(TypeError):
+            memory[Variable()]
+
+    def test_slice(self):
+        registers = Array(size=8)
+        window = registers[2:5]
+        self.assertEqual(
+            [element.name for element in window],
+            [f"{registers.name}_{i}" for i in range(2, 5)],
+        )
+        self.assertNotIsInstance(window[0], BitVec)
+        self.assertEqual(len(registers.touched()), 3)
+
+    def test_elements_model(self):
+        memory = Array(size=1024, bits=8)
+        memory[3] == 7
+        memory[4] == memory[3]
+
+        model = convert_to_pysmt_model()
+        self.assertEqual(model.get_py_value(memory[4]._symbol), 7)
+        self.assertEqual(len(memory.touched()), 2)
+
+    def test_theory(self):
+        registers = Array(size=16, theory=True)
+        index = Variable()
+        self.assertEqual(registers.touched(), {})
+
+        index >= 0
+        index < 16
+        index > 2
+        registers[index] == 42
+        registers[2] == 5
+
+        f = convert_to_pysmt_formula(registers.clauses[0])
+        self.assertEqual(f.serialize(), f"({registers.name}[{index.name}] = 42)")
+
+        model = convert_to_pysmt_model()
+        selected = convert_to_pysmt_formula(registers.clauses[0]).arg(0)
+        self.assertEqual(model.get_py_value(selected), 42)
+        self.assertGreater(model.get_py_value(index._symbol), 2)
+
+    def test_theory_bounds(self):
+        memory = Array("bounded", 10, bits=8, theory=True)
+        index = Variable()
+        index == 20
+        memory[index] == 1
+        self.assertIsNone(convert_to_pysmt_model())
+
+        reset()
+        memory = Array("bounded", 10, bits=8, theory=True)
+        index = Variable()
+        index == 9
+        memory[index + 1] == 1
+        self.assertIsNone(convert_to_pysmt_model())
+
+        reset()
+        memory = Array("bounded", 10, bits=8, theory=True)
+        index = Variable()
+        memory[index + 1] == 1
+        model = convert_to_pysmt_model()
+        self.assertTrue(-1 <= model.get_py_value(index._symbol) < 9)
+
+    def test_theory_bitvec(self):
+        memory = Array(size=256, bits=8, theory=True)
+        memory[1] == 0xFF
+
+        f = convert_to_pysmt_formula(memory.clauses[0])
+        self.assertEqual(f.serialize(), f"({memory.name}[1] = 255_8)")
+
+    def test_theory_not_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with Context() as context:
+                context.result_cache = ResultCache(directory)
+                registers = Array(size=4, theory=True)
+                registers[0] == 1
+                self.assertIsNotNone(context.get_model())
+                self.assertEqual(context.result_cache.misses, 1)
+                self.assertEqual(list(context.result_cache._entries()), [])
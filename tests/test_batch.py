@@ -0,0 +1,57 @@
+import functools
+import unittest
+
+from smtfe import Variable, reset
+from smtfe.batch import solve_batch
+
+
+def bounded(low, high):
+    a = Variable("a")
+    a > low
+    a < high
+
+
+def impossible():
+    a = Variable("a")
+    a * 2 == 7
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_order(self):
+        problems = [functools.partial(bounded, i, i + 2) for i in range(20)]
+        results = solve_batch(problems, workers=2, chunksize=3)
+        self.assertEqual(results, [{"a": i + 1} for i in range(20)])
+
+    def test_mixed(self):
+        s = """(declare-fun x () Int)
+(assert (= x 3))"""
+        results = solve_batch([s, impossible, functools.partial(bounded, 0, 2)])
+        self.assertEqual(results, [{"x": 3}, None, {"a": 1}])
+
+    def test_closures(self):
+        def make(low):
+            def build():
+                # Built in this process, where pysmt symbols are global
+                a = Variable("batch_closure")
+                a > low
+                a < low + 2
+
+            return build
+
+        def unsat():
+            a = Variable("batch_closure")
+            a * 2 == 7
+
+        results = solve_batch([make(i) for i in range(5)] + [unsat], workers=2)
+        self.assertEqual(results, [{"batch_closure": i + 1} for i in range(5)] + [None])
+        self.assertEqual(len(Variable.instances), 0)
+
+    def test_isolation(self):
+        a = Variable("a")
+        a == 100
+        results = solve_batch([functools.partial(bounded, 0, 2)], workers=1)
+        self.assertEqual(results, [{"a": 1}])
+        self.assertEqual(len(a.clauses), 1)
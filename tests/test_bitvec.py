@@ -0,0 +1,125 @@
+import io
+import unittest
+
+from smtfe import BitVec, Variable, reset
+from smtfe.convert import build_formula, convert_to_pysmt_model
+from smtfe.utils import load_smt2
+
+
+class TestBitVec(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_arithmetic(self):
+        x = BitVec("bv_x", 8)
+        x + 1 == 0
+
+        formula = build_formula()
+        self.assertIn("bvadd", formula.to_smtlib(daggify=False))
+        model = convert_to_pysmt_model()
+        # Arithmetic wraps around at the width of the bit-vector
+        self.assertEqual(model.get_py_value(x._symbol), 255)
+
+    def test_bitwise(self):
+        x = BitVec("bv_mask", 8)
+        y = BitVec("bv_flags", 8)
+        (x & 0x0F) == 0x0A
+        (x ^ y) == 0xFF
+        (y >> 4) == 0x0C
+
+        smtlib = build_formula().to_smtlib(daggify=False)
+        for name in ("bvand", "bvxor", "bvlshr"):
+            self.assertIn(name, smtlib)
+        model = convert_to_pysmt_model()
+        self.assertEqual(model.get_py_value(x._symbol) & 0x0F, 0x0A)
+        self.assertEqual(model.get_py_value(x._symbol) ^ model.get_py_value(y._symbol), 0xFF)
+
+    def test_unsigned_comparison(self):
+        x = BitVec("bv_unsigned", 8)
+        x > 200
+        x != 255
+
+        self.assertIn("bvult", build_formula().to_smtlib(daggify=False))
+        value = convert_to_pysmt_model().get_py_value(x._symbol)
+        self.assertTrue(200 < value < 255)
+
+    def test_shift(self):
+        x = BitVec("bv_shift", 16)
+        (x << 3) == 0x0040
+
+        self.assertIn("bvshl", build_formula().to_smtlib(daggify=False))
+        self.assertEqual(convert_to_pysmt_model().get_py_value(x._symbol) & 0x1FFF, 8)
+
+    def test_reflected(self):
+        x = BitVec("bv_reflected", 8)
+        (10 - x) == 3
+
+        self.assertEqual(convert_to_pysmt_model().get_py_value(x._symbol), 7)
+
+    def test_reflected_int(self):
+        a = Variable()
+        (2 - a) == 5
+
+        self.assertEqual(convert_to_pysmt_model().get_py_value(a._symbol), -3)
+
+    def test_negative(self):
+        x = BitVec("bv_negative", 8)
+        y = BitVec("bv_negative_sum", 8)
+        x == -1
+        y + 2 == -3
+
+        model = convert_to_pysmt_model()
+        self.assertEqual(model.get_py_value(x._symbol), 0xFF)
+        self.assertEqual(model.get_py_value(y._symbol), 0xFB)
+
+    def test_extract_concat(self):
+        word = BitVec("bv_word", 16)
+        high = BitVec("bv_high", 8)
+        low = BitVec("bv_low", 8)
+        word.extract(15, 8) == high
+        word.extract(7, 0) == low
+        high.concat(low) == 0xBEEF
+
+        model = convert_to_pysmt_model()
+        self.assertEqual(model.get_py_value(word._symbol), 0xBEEF)
+        self.assertEqual(model.get_py_value(high._symbol), 0xBE)
+        self.assertEqual(model.get_py_value(low._symbol), 0xEF)
+
+    def test_extract_range(self):
+        x = BitVec("bv_range", 8)
+        with self.assertRaises(ValueError):
+            x.extract(2, 5)
+        with self.assertRaises(TypeError):
+            x.concat(1)
+
+    def test_load_smt2(self):
+        s = """(set-logic QF_BV)
+(declare-fun lbv_x () (_ BitVec 8))
+(declare-fun lbv_y () (_ BitVec 8))
+(declare-fun lbv_w () (_ BitVec 16))
+(declare-fun lbv_p () Bool)
+(assert (= (bvadd lbv_x #x01) #x00))
+(assert (bvult lbv_y lbv_x))
+(assert (= (bvand lbv_y #x0f) #x03))
+(assert (bvugt lbv_y #xf0))
+(assert (= (bvxor (bvshl lbv_y #x01) (bvnot #x00)) #x19))
+(assert (= (bvneg (bvlshr lbv_x #x07)) #xff))
+(assert (= ((_ extract 7 0) lbv_w) lbv_y))
+(assert (= (concat lbv_x lbv_y) lbv_w))
+(assert (=> lbv_p (= lbv_y #x00)))
+(assert (= (ite lbv_p #x01 #x02) (bvsub lbv_x #xfd)))
+(check-sat)
+"""
+        variables = load_smt2(io.StringIO(s))
+        model = convert_to_pysmt_model()
+        x, y, w, p = (
+            model.get_py_value(variables[name]._symbol)
+            for name in ("lbv_x", "lbv_y", "lbv_w", "lbv_p")
+        )
+        self.assertEqual(x, 0xFF)
+        self.assertLess(y, x)
+        self.assertEqual(y & 0x0F, 0x03)
+        self.assertGreater(y, 0xF0)
+        self.assertEqual(y, 0xF3)
+        self.assertEqual(w, (x << 8) | y)
+        self.assertFalse(p)
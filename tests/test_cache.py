@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+
+from unittest import mock
+
+from smtfe import BitVec, Context, Function, Variable, convert, reset
+from smtfe.cache import ResultCache, fingerprint
+
+
+def linear(names, order):
+    a = Variable(names[0])
+    b = Variable(names[1])
+    clauses = [lambda: a > 2, lambda: b < 10, lambda: a + 2 * b == 7]
+    for index in order:
+        clauses[index]()
+    return a, b
+
+
+class TestFingerprint(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def clauses(self, context):
+        with context:
+            return convert._collect_clauses()
+
+    def test_renaming_and_order(self):
+        with Context() as first:
+            linear(["x1", "y1"], [0, 1, 2])
+            key, _ = fingerprint(self.clauses(first))
+        with Context() as second:
+            a, b = linear(["x2", "y2"], [2, 1, 0])
+            other, variables = fingerprint(self.clauses(second))
+        self.assertEqual(key, other)
+        self.assertEqual(variables, [a, b])
+
+    def test_symmetric_order(self):
+        keys = []
+        for order in ([0, 1, 2], [1, 0, 2], [2, 1, 0]):
+            with Context() as context:
+                a = Variable()
+                b = Variable()
+                clauses = [lambda: a > 0, lambda: b > 0, lambda: a < b + 5]
+                for index in order:
+                    clauses[index]()
+                key, variables = fingerprint(self.clauses(context))
+                keys.append(key)
+                self.assertEqual(variables, [a, b])
+        self.assertEqual(len(set(keys)), 1)
+
+    def test_structure(self):
+        with Context() as first:
+            linear(["x1", "y1"], [0, 1, 2])
+            key, _ = fingerprint(self.clauses(first))
+        with Context() as second:
+            a, b = linear(["x2", "y2"], [0, 1])
+            b + 2 * a == 7
+            other, _ = fingerprint(self.clauses(second))
+        self.assertNotEqual(key, other)
+
+    def test_bitvec_width(self):
+        keys = []
+        for bits in (8, 16):
+            with Context() as context:
+                v = BitVec(None, bits)
+                v == 1
+                keys.append(fingerprint(self.clauses(context))[0])
+        self.assertNotEqual(keys[0], keys[1])
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        reset()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_reuse(self):
+        with Context() as first:
+            first.result_cache = self.cache
+            a, b = linear([None, None], [0, 1, 2])
+            model = first.get_model()
+        self.assertEqual(self.cache.misses, 1)
+        expected = (model.get_py_value(a._symbol), model.get_py_value(b._symbol))
+
+        with Context() as second:
+            second.result_cache = self.cache
+            a, b = linear([None, None], [1, 2, 0])
+            with mock.patch("smtfe.convert._solve_formula") as solve:
+                model = second.get_model()
+            solve.assert_not_called()
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(
+            (model.get_py_value(a._symbol), model.get_py_value(b._symbol)), expected
+        )
+
+    def test_unsat(self):
+        for _ in range(2):
+            with Context() as context:
+                context.result_cache = self.cache
+                a = Variable()
+                a * 2 == 7
+                self.assertFalse(context.check_sat())
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_function_body(self):
+        values = []
+        for body in (lambda p: p + 1, lambda p: p * 10):
+            with Context() as context:
+                context.result_cache = self.cache
+                helper = Function("helper", body)
+                x = Variable()
+                y = Variable()
+                x == 3
+                y == helper(x)
+                values.append(context.get_model().get_py_value(y._symbol))
+        self.assertEqual(values, [4, 30])
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_eviction(self):
+        cache = ResultCache(self.directory.name, max_bytes=100)
+        for i in range(5):
+            cache.put(f"key{i}", {"sat": True, "values": [[0, "Int", i]]})
+        self.assertLessEqual(
+            sum(entry.stat().st_size for entry in os.scandir(self.directory.name)), 100
+        )
+        self.assertEqual(cache.get("key4")["values"], [[0, "Int", 4]])
+        self.assertIsNone(cache.get("key0"))
@@ -0,0 +1,86 @@
+import unittest
+
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from smtfe import Context, Variable, components, reset
+from smtfe.components import split_components
+
+
+def clusters(count):
+    variables = []
+    for index in range(count):
+        a = Variable()
+        b = Variable()
+        a > index
+        a + b == 2 * index + 10
+        variables.append((a, b))
+    return variables
+
+
+class TestComponents(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_split(self):
+        a = Variable()
+        b = Variable()
+        c = Variable()
+        d = Variable()
+        a > 0
+        c < 5
+        b == a + 1
+        d == c
+        clauses = a.clauses + b.clauses + c.clauses + d.clauses
+        parts = split_components(clauses)
+        self.assertEqual(len(parts), 2)
+        self.assertEqual([len(part) for part in parts], [2, 2])
+        self.assertIs(parts[0][0], a.clauses[0])
+        self.assertIn(b.clauses[0], parts[0])
+        self.assertIn(d.clauses[0], parts[1])
+
+    def test_merge(self):
+        with Context(keep_alive=True) as context:
+            context.split_components = True
+            variables = clusters(5)
+            model = context.get_model()
+        self.assertEqual(len(context._components), 5)
+        for index, (a, b) in enumerate(variables):
+            a_value = model.get_py_value(a._symbol)
+            self.assertGreater(a_value, index)
+            self.assertEqual(a_value + model.get_py_value(b._symbol), 2 * index + 10)
+
+    def test_unsat(self):
+        with Context(keep_alive=True) as context:
+            context.split_components = True
+            clusters(2)
+            c = Variable()
+            c > 1
+            c < 1
+            self.assertFalse(context.check_sat())
+
+    def test_unchanged_components_reused(self):
+        with Context(keep_alive=True) as context:
+            context.split_components = True
+            clusters(3)
+            context.get_model()
+            extra = Variable()
+            extra == 4
+            with mock.patch.object(
+                components, "_solve_formula", wraps=components._solve_formula
+            ) as solve:
+                model = context.get_model()
+        self.assertEqual(solve.call_count, 1)
+        self.assertEqual(len(context._components), 4)
+        self.assertEqual(model.get_py_value(extra._symbol), 4)
+
+    def test_executor(self):
+        with ProcessPoolExecutor(2) as executor:
+            with Context(keep_alive=True) as context:
+                context.split_components = True
+                context.component_executor = executor
+                variables = clusters(3)
+                model = context.get_model()
+        for index, (a, b) in enumerate(variables):
+            a_value = model.get_py_value(a._symbol)
+            self.assertEqual(a_value + model.get_py_value(b._symbol), 2 * index + 10)
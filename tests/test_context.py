@@ -0,0 +1,105 @@
+import asyncio
+import gc
+import threading
+import unittest
+
+from smtfe import Context, Variable, current_context, reset, set_hash_consing
+
+
+class TestContext(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_isolation(self):
+        outer = Variable()
+        outer > 0
+        with Context() as first:
+            a = Variable()
+            a == 1
+            self.assertIs(current_context(), first)
+            with Context() as second:
+                b = Variable()
+                b == 2
+                self.assertEqual(list(Variable.instances), [b])
+            self.assertEqual(list(Variable.instances), [a])
+        self.assertEqual(list(Variable.instances), [outer])
+
+        self.assertEqual(str(first.get_model()), f"{a.name} := 1")
+        self.assertEqual(str(second.get_model()), f"{b.name} := 2")
+
+    def test_reset(self):
+        a = Variable()
+        with Context() as context:
+            b = Variable()
+            reset()
+            self.assertEqual(len(Variable.instances), 0)
+        self.assertEqual(list(Variable.instances), [a])
+        self.assertNotIn(b, context.instances(Variable))
+
+    def test_keep_alive(self):
+        def build():
+            a = Variable()
+            a > 1
+
+        with Context() as weak:
+            build()
+            gc.collect()
+        with Context(keep_alive=True) as strong:
+            build()
+            gc.collect()
+        self.assertEqual(len(weak.instances(Variable)), 0)
+        self.assertEqual(len(strong.instances(Variable)), 1)
+        self.assertTrue(strong.check_sat())
+
+    def test_hash_consing(self):
+        a = Variable()
+        with Context():
+            set_hash_consing()
+            self.assertIs(a * 2, a * 2)
+        self.assertIsNot(a * 2, a * 2)
+
+    def test_session(self):
+        with Context() as context:
+            a = Variable()
+            a > 2
+        b = Variable()
+        b < 0
+        self.assertTrue(context.session.check_sat())
+        a < 2
+        self.assertFalse(context.session.check_sat())
+        self.assertEqual(context.session.sync(), 0)
+        context.reset()
+
+    def test_threads(self):
+        results = {}
+
+        def solve(i):
+            with Context() as context:
+                a = Variable(f"thread{i}")
+                a > i
+                a < i + 2
+                results[i] = context.get_model().get_py_value(a._symbol)
+
+        threads = [threading.Thread(target=solve, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {i: i + 1 for i in range(8)})
+
+    def test_tasks(self):
+        async def solve(i):
+            with Context() as context:
+                a = Variable(f"task{i}")
+                await asyncio.sleep(0)
+                a > i
+                await asyncio.sleep(0)
+                a < i + 2
+                await asyncio.sleep(0)
+                self.assertEqual(list(Variable.instances), [a])
+                return context.get_model().get_py_value(a._symbol)
+
+        async def main():
+            return await asyncio.gather(*[solve(i) for i in range(8)])
+
+        self.assertEqual(asyncio.run(main()), [i + 1 for i in range(8)])
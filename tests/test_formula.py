@@ -1,9 +1,21 @@
+import io
+import mmap
 import operator
+import tempfile
 import unittest
 
+from pysmt.shortcuts import get_model
+
 from smtfe import BitVec, Clause, Function, Variable, reset
-from smtfe.convert import convert_to_pysmt_formula, join_formula
-from smtfe.utils import get_formula, emit_smt2
+from smtfe.convert import (
+    ConversionCache,
+    _derive_py_type,
+    convert_to_pysmt_formula,
+    convert_to_pysmt_model,
+    get_variables,
+    join_formula,
+)
+from smtfe.utils import get_formula, emit_smt2, load_smt2, write_smt2
 
 
 class TestFormula(unittest.TestCase):
@@ -77,9 +89,17 @@ class TestFormula(unittest.TestCase):
         f = join_formula(a.clauses + b.clauses)
         self.assertEqual(
             f.serialize(100),
-            f"((2 < {a_uuid}) & ((({a_uuid} + ({b_uuid} * 2)) = 7) & ({b_uuid} < 10)))",
+            f"((2 < {a_uuid}) & (({a_uuid} + ({b_uuid} * 2)) = 7) & ({b_uuid} < 10))",
         )
 
+    def test_join_many(self):
+        a = Variable()
+        for i in range(5000):
+            a > i
+        f = join_formula(a.clauses)
+        self.assertEqual(len(f.args()), 5000)
+        self.assertTrue(all(arg.is_lt() for arg in f.args()))
+
     def test_demorgan(self):
         a = Variable("a")
         b = Variable("b")
@@ -105,6 +125,65 @@ class TestFormula(unittest.TestCase):
         f = get_formula(s)
         self.assertIsNotNone(f)
 
+    def test_load_demorgan(self):
+        s = """(declare-const a Bool)
+(declare-const b Bool)
+(define-fun demorgan ()  Bool
+  (= (and a b) (not (or (not a) (not b)))))
+(assert demorgan)
+(assert (not b))
+(check-sat)"""
+        variables = load_smt2(io.StringIO(s))
+        a = variables["a"]
+        b = variables["b"]
+        self.assertEqual(len(a.clauses) + len(b.clauses), 2)
+        f = join_formula(a.clauses + b.clauses)
+        self.assertEqual(
+            f.serialize(100), "(((b & a) <-> (! ((! a) | (! b)))) & (! b))"
+        )
+        self.assertEqual(str(convert_to_pysmt_model()), "b := False\na := False")
+
+    def test_load_constant_assertions(self):
+        s = """(declare-fun lc_x () Int)
+(assert (> lc_x 2))
+(assert true)
+(assert false)"""
+        load_smt2(io.StringIO(s))
+        self.assertIsNone(convert_to_pysmt_model())
+
+        reset()
+        load_smt2(io.StringIO("(declare-fun lc_y () Int)\n(assert (= 1 2))"))
+        self.assertIsNone(convert_to_pysmt_model())
+
+        reset()
+        load_smt2(io.StringIO("(assert false)"))
+        self.assertIsNone(convert_to_pysmt_model())
+
+    def test_load_mmap(self):
+        s = b"""(declare-fun x () Int)
+(declare-fun y () Int)
+(declare-fun z () (_ BitVec 8))
+(assert (> x 2))
+(assert (<= (+ x (* 2 y)) 12))
+(assert (= z #x0a))
+(assert (>= (- y x) 0))
+"""
+        with tempfile.TemporaryFile() as fh:
+            fh.write(s)
+            fh.flush()
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                variables = load_smt2(mm)
+        self.assertEqual(sorted(variables), ["x", "y", "z"])
+        self.assertIsInstance(variables["z"], BitVec)
+        self.assertEqual(variables["z"].bits, 8)
+        model = convert_to_pysmt_model()
+        x = model.get_py_value(variables["x"]._symbol)
+        y = model.get_py_value(variables["y"]._symbol)
+        self.assertGreater(x, 2)
+        self.assertLessEqual(x + 2 * y, 12)
+        self.assertGreaterEqual(y - x, 0)
+        self.assertEqual(model.get_py_value(variables["z"]._symbol), 10)
+
     def test_demorgan_function(self):
         a = Variable("a")
         b = Variable("b")
@@ -125,6 +204,97 @@ class TestFormula(unittest.TestCase):
             ],
         )
 
+    def test_write_smt2(self):
+        a = Variable("a")
+        b = Variable("b")
+
+        @Function.wrap
+        def demorgan():
+            return (a & b) == (~((~a) | (~b)))
+
+        myu32 = BitVec("myu32", 32)
+        myu32 == 0x0000000A
+
+        fh = io.StringIO()
+        write_smt2(fh, logic="QF_BV")
+        lines = fh.getvalue().splitlines()
+        self.assertEqual(lines[0], "(set-logic QF_BV)")
+        self.assertEqual(lines[-1], "(check-sat)")
+        self.assertEqual(
+            sorted(line for line in lines if line.startswith("(declare-fun")),
+            [
+                "(declare-fun a () Bool)",
+                "(declare-fun b () Bool)",
+                "(declare-fun myu32 () (_ BitVec 32))",
+            ],
+        )
+        self.assertEqual(len([line for line in lines if line.startswith("(assert")]), 2)
+
+        f = get_formula(fh.getvalue())
+        self.assertEqual(len(f.args()), 2)
+
+    def test_write_smt2_define_fun(self):
+        variables = [Variable() for _ in range(50)]
+
+        @Function.wrap
+        def exclusive(p, q):
+            return (p | q) & ~(p & q)
+
+        for p, q in zip(variables, variables[1:]):
+            exclusive(p, q)
+
+        fh = io.StringIO()
+        write_smt2(fh)
+        lines = fh.getvalue().splitlines()
+        definitions = [line for line in lines if line.startswith("(define-fun")]
+        self.assertEqual(len(definitions), 1)
+        self.assertTrue(definitions[0].startswith("(define-fun exclusive ((exclusive.p"))
+        self.assertEqual(lines.count("(check-sat)"), 1)
+        self.assertEqual(len([line for line in lines if line.startswith("(assert")]), 49)
+        self.assertEqual(len(exclusive._definitions), 1)
+
+        f = get_formula(fh.getvalue())
+        self.assertEqual(len(f.args()), 49)
+
+    def test_write_smt2_same_name(self):
+        def make(k):
+            @Function.wrap
+            def shifted(p):
+                return p + k
+
+            return shifted
+
+        first = make(1)
+        second = make(2)
+        x = Variable()
+        y = Variable()
+        first(x) == 5
+        second(y) == 5
+
+        fh = io.StringIO()
+        write_smt2(fh)
+        lines = fh.getvalue().splitlines()
+        definitions = [line for line in lines if line.startswith("(define-fun")]
+        self.assertEqual(len(definitions), 2)
+
+        model = get_model(get_formula(fh.getvalue()))
+        self.assertEqual(model.get_py_value(x._symbol), 4)
+        self.assertEqual(model.get_py_value(y._symbol), 3)
+
+    def test_function_signatures(self):
+        x = Variable()
+        y = BitVec(None, 8)
+
+        @Function.wrap
+        def same(p, q):
+            return p == q
+
+        same(x, 3)
+        same(y, 3)
+        join_formula(x.clauses + y.clauses)
+        signatures = sorted(str(signature) for signature in same._definitions)
+        self.assertEqual(signatures, ["(BV{8}, BV{8})", "(Int, Int)"])
+
     def test_bitvec(self):
         # https://stackoverflow.com/questions/7165118/assign-value-to-a-bitvector-smtlib2-z3/7165324#7165324
         myu32 = BitVec("myu32", 32)
@@ -132,3 +302,73 @@ class TestFormula(unittest.TestCase):
         myu32 == 0x0000000A
 
         self.assertEqual(repr(myu32.clauses), repr([Clause(myu32, operator.eq, 10)]))
+
+    def test_clause_then_variable(self):
+        a = Variable()
+        b = Variable()
+        (a + 1) - b == 0
+        f = convert_to_pysmt_formula(a.clauses[0])
+        self.assertEqual(f.serialize(), f"((({a.name} + 1) - {b.name}) = 0)")
+
+    def test_deep_left(self):
+        a = Variable()
+        expr = a
+        for _ in range(20000):
+            expr = expr + 1
+        expr == 5
+        self.assertIs(a.clauses[0]._find_variable(), a)
+        f = convert_to_pysmt_formula(a.clauses[0])
+        self.assertEqual(f.arg(1).constant_value(), 5)
+        self.assertEqual(get_variables(a.clauses[0]), {a})
+
+    def test_deep_right(self):
+        variables = [Variable() for _ in range(20000)]
+        expr = variables[-1] + 0
+        for variable in reversed(variables[:-1]):
+            expr = variable + expr
+        expr == 7
+        clause = variables[0].clauses[0]
+        self.assertEqual(len(get_variables(clause)), 20000)
+        self.assertIs(_derive_py_type(clause), int)
+        f = convert_to_pysmt_formula(clause)
+        self.assertEqual(f.arg(1).constant_value(), 7)
+        self.assertIs(f.arg(0).arg(0), variables[0]._symbol)
+
+    def test_load_smt2_deep(self):
+        depth = 5000
+        s = "(declare-fun d () Int)\n(assert (= " + "(+ " * depth + "d" + " 1)" * depth + " 6000))"
+        variables = load_smt2(io.StringIO(s))
+        model = convert_to_pysmt_model()
+        self.assertEqual(model.get_py_value(variables["d"]._symbol), 1000)
+
+    def test_conversion_cache(self):
+        a = Variable()
+        doubled = a * 2
+        doubled > 4
+        doubled < 10
+        cache = ConversionCache()
+        f = join_formula(a.clauses, cache)
+        self.assertEqual(len(f.args()), 2)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 1)
+
+        self.assertIs(convert_to_pysmt_formula(a.clauses[0], cache), f.args()[0])
+        self.assertEqual(cache.hits, 3)
+
+        a.clauses[0].other = 5
+        convert_to_pysmt_formula(a.clauses[0], cache)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.hits, 4)
+
+    def test_conversion_cache_descendant(self):
+        a = Variable()
+        c = (a * 2) > 4
+        cache = ConversionCache()
+        before = convert_to_pysmt_formula(c, cache)
+
+        # Changing a descendant invalidates every entry above it
+        c.this.other = 3
+        after = convert_to_pysmt_formula(c, cache)
+        self.assertIsNot(after, before)
+        self.assertIn("3", after.serialize())
+        self.assertIs(after, convert_to_pysmt_formula(c, ConversionCache()))
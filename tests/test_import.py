@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import smtfe
+
+_HEAVY = ("pysmt", "z3", "numpy")
+
+
+def importtime(statement):
+    env = dict(os.environ)
+    source = os.path.dirname(os.path.dirname(smtfe.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source, env.get("PYTHONPATH")]))
+    code = f"{statement}; import sys; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative, result.stdout.split()
+
+
+class TestImport(unittest.TestCase):
+    def test_no_solver_modules(self):
+        _, modules = importtime("import smtfe")
+        self.assertEqual([name for name in modules if name.startswith(_HEAVY)], [])
+
+    def test_build_without_solver_modules(self):
+        _, modules = importtime(
+            "from smtfe import Variable; a = Variable(); a > 1; a.clauses"
+        )
+        self.assertEqual([name for name in modules if name.startswith(_HEAVY)], [])
+
+    def test_solve_without_numpy(self):
+        _, modules = importtime(
+            "import smtfe; a = smtfe.Variable(); a > 1; smtfe.current_context().get_model()"
+        )
+        self.assertIn("smtfe.convert", modules)
+        self.assertIn("smtfe.linear", modules)
+        self.assertEqual([name for name in modules if name.startswith("numpy")], [])
+
+    def test_lazy_attributes(self):
+        _, modules = importtime("import smtfe; smtfe.Session; smtfe.aio")
+        self.assertIn("pysmt.shortcuts", modules)
+        self.assertIn("smtfe.aio", modules)
+
+    def test_import_time(self):
+        cumulative, _ = importtime("import smtfe; import pysmt.shortcuts")
+        # Loading smtfe must stay well below what pysmt alone costs
+        self.assertLess(cumulative["smtfe"], cumulative["pysmt.shortcuts"])
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            smtfe.missing
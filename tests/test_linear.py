@@ -0,0 +1,70 @@
+import operator
+import unittest
+
+from smtfe import Variable, reset
+from smtfe.convert import convert_to_pysmt_formula, convert_to_pysmt_model
+from smtfe.linear import constraints, bounds, terms
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestLinear(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_terms(self):
+        x = [Variable() for _ in range(3)]
+        rows = terms(numpy.array([[1, 0, 2], [0, 0, 0]]), x)
+        self.assertEqual(rows[0].coefficients, [1, 2])
+        self.assertEqual(rows[0].variables, [x[0], x[2]])
+        self.assertEqual(rows[1].variables, [])
+        self.assertEqual(sum(len(variable.clauses) for variable in x), 0)
+
+        f = convert_to_pysmt_formula(rows[0])
+        self.assertEqual(
+            f.serialize(),
+            f"({x[0].name} + (2 * {x[2].name}))",
+        )
+        self.assertEqual(convert_to_pysmt_formula(rows[1]).constant_value(), 0)
+
+    def test_terms_shape(self):
+        x = [Variable() for _ in range(2)]
+        with self.assertRaises(ValueError):
+            terms(numpy.ones((2, 3), dtype=int), x)
+        with self.assertRaises(TypeError):
+            terms(numpy.ones((2, 2)), x)
+
+    def test_constraints(self):
+        x = [Variable() for _ in range(4)]
+        A = numpy.array([[1, 1, 0, 0], [0, 1, 1, 0], [0, 0, 1, 1], [1, 0, 0, -1]])
+        b = numpy.array([5, 7, 8, 0])
+        rows = constraints(A, x, b, operator.eq)
+        self.assertEqual(len(rows), 4)
+        bounds(x, lo=0, hi=numpy.array([3, 10, 10, 10]))
+        self.assertEqual(len(x[0].clauses), 4)
+
+        model = convert_to_pysmt_model()
+        values = numpy.array([model.get_py_value(variable._symbol) for variable in x])
+        numpy.testing.assert_array_equal(A @ values, b)
+        self.assertTrue((values >= 0).all())
+        self.assertLessEqual(values[0], 3)
+
+    def test_constraints_with_operators(self):
+        x = [Variable() for _ in range(2)]
+        total = terms(numpy.array([[2, 3]]), x)[0] + 1
+        total == 14
+        bounds(x, lo=1)
+
+        model = convert_to_pysmt_model()
+        values = [model.get_py_value(variable._symbol) for variable in x]
+        self.assertEqual(2 * values[0] + 3 * values[1], 13)
+
+    def test_unsat(self):
+        x = [Variable() for _ in range(2)]
+        constraints(numpy.identity(2, dtype=int), x, 0, operator.gt)
+        constraints(numpy.ones((1, 2), dtype=int), x, [1], operator.lt)
+        self.assertIsNone(convert_to_pysmt_model())
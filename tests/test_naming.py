@@ -0,0 +1,69 @@
+import io
+import unittest
+
+from smtfe import BitVec, Context, Variable, reset
+from smtfe.naming import CounterNaming, UuidNaming
+from smtfe.utils import write_smt2
+
+try:
+    import shortuuid
+except ImportError:
+    shortuuid = None
+
+
+class TestNaming(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_default(self):
+        a = Variable()
+        b = Variable()
+        self.assertTrue(a.name.startswith("v!"))
+        self.assertEqual(int(b.name[2:]), int(a.name[2:]) + 1)
+        self.assertEqual(Variable("a").name, "a")
+
+    def test_unique_across_contexts(self):
+        names = set()
+        for _ in range(3):
+            with Context():
+                names.update(Variable().name for _ in range(10))
+        self.assertEqual(len(names), 30)
+
+    def test_reproducible(self):
+        def build():
+            with Context(keep_alive=True, naming=CounterNaming("naming_r")):
+                a = Variable()
+                b = Variable()
+                a > 1
+                a + b == 3
+                fh = io.StringIO()
+                write_smt2(fh)
+                return fh.getvalue()
+
+        script = build()
+        self.assertIn("(declare-fun naming_r0 () Int)", script)
+        self.assertIn("(declare-fun naming_r1 () Int)", script)
+        self.assertEqual(build(), script)
+
+    def test_sort_conflict(self):
+        with Context(naming=CounterNaming()) as first:
+            a = Variable()
+            a > 1
+            self.assertTrue(first.check_sat())
+        with Context(naming=CounterNaming()) as second:
+            b = BitVec(None, 8)
+            b == 3
+            self.assertTrue(second.check_sat())
+        self.assertEqual(a.name, b.name)
+        self.assertNotEqual(a._symbol, b._symbol)
+        self.assertTrue(b._symbol.symbol_type().is_bv_type())
+
+    @unittest.skipIf(shortuuid is None, "shortuuid is not installed")
+    def test_uuid(self):
+        with Context(naming=UuidNaming()):
+            a = Variable()
+            b = Variable()
+        self.assertGreater(len(a.name), 20)
+        self.assertEqual(len(a.name), len(b.name))
+        self.assertNotEqual(a.name, b.name)
+        self.assertTrue(a.name.isalpha())
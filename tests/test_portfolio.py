@@ -0,0 +1,50 @@
+import unittest
+
+from pysmt.shortcuts import get_env
+
+from smtfe import BitVec, Variable, portfolio, reset
+
+SOLVERS = sorted(get_env().factory.all_solvers())
+
+
+@unittest.skipUnless(SOLVERS, "no pysmt solver installed")
+class TestPortfolio(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_sat(self):
+        a = Variable()
+        b = Variable()
+        a > 2
+        b < 10
+        a + 2 * b == 7
+        model = portfolio.get_model(SOLVERS * 2)
+        a_value = model.get_py_value(a._symbol)
+        b_value = model.get_py_value(b._symbol)
+        self.assertGreater(a_value, 2)
+        self.assertLess(b_value, 10)
+        self.assertEqual(a_value + 2 * b_value, 7)
+
+    def test_unsat(self):
+        a = Variable()
+        a * 2 == 7
+        self.assertFalse(portfolio.check_sat(SOLVERS))
+
+    def test_bitvec(self):
+        myu32 = BitVec("myu32", 32)
+        myu32 == 0x0000000A
+        model = portfolio.get_model(SOLVERS)
+        self.assertEqual(str(model), "myu32 := 10_32")
+
+    def test_failing_solver(self):
+        a = Variable()
+        a > 2
+        self.assertTrue(portfolio.check_sat(["missing"] + SOLVERS))
+        with self.assertRaisesRegex(RuntimeError, "missing"):
+            portfolio.check_sat(["missing", "missing"])
+
+    def test_timeout(self):
+        a = Variable()
+        a > 2
+        with self.assertRaises(TimeoutError):
+            portfolio.check_sat(SOLVERS, timeout=0)
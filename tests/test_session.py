@@ -0,0 +1,127 @@
+import unittest
+
+from smtfe import Function, Session, Variable, reset
+
+
+class TestSession(unittest.TestCase):
+    def setUp(self):
+        reset()
+        self.session = Session()
+
+    def tearDown(self):
+        self.session.close()
+
+    def test_incremental(self):
+        a = Variable()
+        a > 2
+        self.assertTrue(self.session.check_sat())
+        self.assertEqual(self.session.sync(), 0)
+
+        a < 5
+        self.assertEqual(self.session.sync(), 1)
+        model = self.session.get_model()
+        self.assertIn(model.get_py_value(a._symbol), [3, 4])
+
+        a == 7
+        self.assertFalse(self.session.check_sat())
+
+    def test_consumed_clause(self):
+        a = Variable()
+        b = Variable()
+        x = a > 2
+        self.assertTrue(self.session.check_sat())
+
+        x | (b < 5)
+        a < 1
+        self.assertTrue(self.session.check_sat())
+        model = self.session.get_model()
+        self.assertLess(model.get_py_value(a._symbol), 1)
+        self.assertLess(model.get_py_value(b._symbol), 5)
+
+    def test_consumed_clause_scope(self):
+        a = Variable()
+        b = Variable()
+        a > 0
+        self.session.push()
+        x = a > 2
+        self.assertTrue(self.session.check_sat())
+        x | (b < 5)
+        a < 2
+        self.assertTrue(self.session.check_sat())
+        self.session.pop()
+        self.assertEqual(len(a.clauses), 1)
+        self.assertTrue(self.session.check_sat())
+
+        # An outer clause consumed by an inner scope comes back on pop
+        for sync in (True, False):
+            reset()
+            with Session() as session:
+                a = Variable()
+                b = Variable()
+                x = a > 2
+                self.assertTrue(session.check_sat())
+                session.push()
+                x | (b < 5)
+                a < 0
+                b > 10
+                if sync:
+                    self.assertFalse(session.check_sat())
+                session.pop()
+                (clause,) = a.clauses
+                self.assertIs(clause, x)
+                self.assertTrue(session.check_sat())
+                a < 0
+                self.assertFalse(session.check_sat())
+
+    def test_cache(self):
+        a = Variable()
+        doubled = a * 2
+        doubled > 4
+        self.assertTrue(self.session.check_sat())
+        self.assertEqual(self.session.cache.misses, 2)
+        self.assertEqual(self.session.cache.hits, 0)
+
+        doubled < 10
+        self.assertTrue(self.session.check_sat())
+        self.assertEqual(self.session.cache.misses, 3)
+        self.assertEqual(self.session.cache.hits, 1)
+        self.assertEqual(len(self.session.cache), 3)
+
+    def test_push_pop(self):
+        a = Variable()
+        a > 2
+        self.session.push()
+        a < 0
+        self.assertFalse(self.session.check_sat())
+        self.session.pop()
+        self.assertEqual(len(a.clauses), 1)
+        self.assertTrue(self.session.check_sat())
+
+    def test_pop_unchecked(self):
+        a = Variable()
+        a > 2
+        self.session.push()
+        a < 0
+        self.session.pop()
+        self.assertEqual(len(a.clauses), 1)
+        self.assertTrue(self.session.check_sat())
+
+    def test_pop_empty(self):
+        with self.assertRaises(IndexError):
+            self.session.pop()
+
+    def test_function(self):
+        a = Variable("a")
+        b = Variable("b")
+
+        @Function.wrap
+        def demorgan():
+            return (a & b) == (~((~a) | (~b)))
+
+        self.assertTrue(self.session.check_sat())
+        self.assertEqual(self.session.sync(), 0)
+
+        a & ~b
+        model = self.session.get_model()
+        self.assertEqual(model.get_py_value(a._symbol), True)
+        self.assertEqual(model.get_py_value(b._symbol), False)
@@ -0,0 +1,67 @@
+import unittest
+
+from pysmt.shortcuts import And, Equals, Int, Not, Or, Symbol, Times
+from pysmt.typing import INT
+
+from smtfe import Context, Variable, reset
+from smtfe.convert import join_formula
+from smtfe.simplify import SimplifyStats, simplify
+
+
+class TestSimplify(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_simplify(self):
+        p = Symbol("simplify_p")
+        q = Symbol("simplify_q")
+        n = Symbol("simplify_n", INT)
+        f = And(
+            And(p, Not(Not(q))),
+            And(p, Equals(Times(Int(2), Int(3)), n)),
+            Or(Or(p, q), q),
+        )
+        stats = SimplifyStats()
+        g = simplify(f, stats)
+        self.assertTrue(g.is_and())
+        # pysmt orders the flattened disjuncts by hash, so compare them as a set
+        args = {frozenset(arg.args()) if arg.is_or() else arg for arg in g.args()}
+        self.assertEqual(args, {p, q, frozenset((p, q)), Equals(Int(6), n)})
+        self.assertEqual(stats.conjuncts_before, 3)
+        self.assertEqual(stats.conjuncts_after, 4)
+        self.assertLess(stats.nodes_after, stats.nodes_before)
+        self.assertLess(stats.ratio, 1)
+
+    def test_clauses(self):
+        a = Variable()
+        b = Variable()
+        ~~a == True
+        ~~a == True
+        (a & b) == True
+        f = join_formula(a.clauses)
+        stats = SimplifyStats()
+        simplify(f, stats)
+        self.assertEqual(stats.conjuncts_after, 2)
+        self.assertLess(stats.nodes_after, stats.nodes_before)
+
+    def test_context(self):
+        with Context(keep_alive=True) as context:
+            context.simplify = True
+            a = Variable()
+            b = Variable()
+            c = Variable()
+            a > 1 + 2
+            ~~(b | c) == True
+            c == False
+            model = context.get_model()
+        self.assertGreater(model.get_py_value(a._symbol), 3)
+        self.assertTrue(model.get_py_value(b._symbol))
+        stats = context.simplify_stats
+        self.assertLess(stats.nodes_after, stats.nodes_before)
+
+    def test_disabled(self):
+        with Context(keep_alive=True) as context:
+            a = Variable()
+            a > 3
+            context.get_model()
+        self.assertIsNone(context.simplify_stats)
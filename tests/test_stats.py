@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+
+from smtfe import Context, Variable, reset
+from smtfe.cache import ResultCache
+from smtfe.stats import NULL_STATS, SolveStats
+
+
+def problem():
+    a = Variable()
+    b = Variable()
+    a > 2
+    doubled = b * 2
+    doubled > a
+    doubled < 10
+    return a, b
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        reset()
+
+    def test_phases(self):
+        stats = SolveStats()
+        with stats.phase("convert"):
+            pass
+        with stats.phase("convert"):
+            pass
+        stats.count("clauses", 3)
+        stats.count("clauses")
+        values = stats.as_dict()
+        self.assertEqual(set(values), {"convert_seconds", "clauses"})
+        self.assertGreaterEqual(values["convert_seconds"], 0)
+        self.assertEqual(values["clauses"], 4)
+
+    def test_null(self):
+        with NULL_STATS.phase("convert"):
+            NULL_STATS.count("clauses")
+        self.assertFalse(NULL_STATS.enabled)
+
+    def test_disabled(self):
+        with Context(keep_alive=True) as context:
+            problem()
+            context.get_model()
+        self.assertIsNone(context.last_stats)
+
+    def test_get_model(self):
+        reports = []
+        with Context(keep_alive=True) as context:
+            context.stats_callbacks.append(reports.append)
+            problem()
+            context.get_model()
+            context.get_model()
+        self.assertEqual(len(reports), 2)
+        first = reports[0].as_dict()
+        for phase in ("total", "collect", "convert", "solver_start", "solve", "complete"):
+            self.assertIn(f"{phase}_seconds", first)
+        self.assertGreaterEqual(
+            first["total_seconds"], first["convert_seconds"] + first["solve_seconds"]
+        )
+        self.assertEqual(first["clauses"], 3)
+        self.assertEqual(first["cache_misses"], 4)
+        self.assertEqual(first["cache_hits"], 1)
+        self.assertGreater(first["nodes"], 5)
+        self.assertEqual(first["sat"], 1)
+
+        second = reports[1].as_dict()
+        self.assertEqual(second["model_cache_hits"], 1)
+        self.assertNotIn("solve_seconds", second)
+        self.assertIs(context.last_stats, reports[1])
+
+    def test_result_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for _ in range(2):
+                with Context(keep_alive=True) as context:
+                    context.profile = True
+                    context.result_cache = ResultCache(directory)
+                    problem()
+                    context.get_model()
+        values = context.last_stats.as_dict()
+        self.assertEqual(values["result_cache_hits"], 1)
+        self.assertIn("fingerprint_seconds", values)
+        self.assertNotIn("solve_seconds", values)
+
+    def test_components(self):
+        with Context(keep_alive=True) as context:
+            context.profile = True
+            context.split_components = True
+            problem()
+            c = Variable()
+            c == 1
+            context.get_model()
+        values = context.last_stats.as_dict()
+        self.assertEqual(values["components"], 2)
+        self.assertEqual(values["components_solved"], 2)
+        self.assertIn("split_seconds", values)
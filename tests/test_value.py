@@ -1,10 +1,15 @@
+import contextlib
+import io
 import operator
 import unittest
 
+from unittest import mock
+
 import pysmt.operators as op
 from pysmt.fnode import FNode
+from pysmt.shortcuts import Int
 
-from smtfe import BitVec, Clause, Variable, reset
+from smtfe import BitVec, Clause, Variable, check_sat, convert, reset
 from smtfe.convert import get_values, get_value_str
 
 
@@ -47,6 +52,13 @@ class TestValue(unittest.TestCase):
             s, f"(({a._symbol.symbol_name()} 7)\n ({b._symbol.symbol_name()} 0))"
         )
 
+    def test_term_str(self):
+        a = Variable()
+        a > 2
+        a < 4
+        s = get_value_str((a + 1, a))
+        self.assertEqual(s, f"((({a.name} + 1) 4)\n ({a.name} 3))")
+
     def test_multiple_statements(self):
         a = Variable()
         b = Variable()
@@ -74,3 +86,50 @@ class TestValue(unittest.TestCase):
 
         s = get_value_str((myu32,))
         self.assertEqual(s, "((" + str(myu32._symbol) + " #x0000000a))")
+
+    def test_requested_terms(self):
+        a = Variable()
+        b = Variable()
+        a > 2
+        b < 10
+        a + 2 * b == 7
+        values = get_values((a,))
+        self.assertEqual(values, {a._symbol: Int(7)})
+        values = get_values((a + b,))
+        self.assertEqual(list(values.values()), [Int(7)])
+
+    def test_assertion_terms(self):
+        a = Variable()
+        b = Variable()
+        c = a > 5
+        b == 1
+        values = get_values((c, a))
+        self.assertTrue(values[convert.convert_to_pysmt_formula(c)].constant_value())
+        self.assertGreater(values[a._symbol].constant_value(), 5)
+        (clause,) = a.clauses
+        self.assertIs(clause, c)
+
+        get_values((a + 1,))
+        get_values((c,))
+        self.assertEqual(len(a.clauses), 1)
+        self.assertIsNotNone(convert.convert_to_pysmt_model())
+
+    def test_solve_once(self):
+        a = Variable()
+        a > 0
+        with mock.patch(
+            "smtfe.convert._solve_formula", wraps=convert._solve_formula
+        ) as solve:
+            with contextlib.redirect_stdout(io.StringIO()):
+                check_sat()
+            get_values((a,))
+            get_value_str((a,))
+            self.assertEqual(solve.call_count, 1)
+            a < 2
+            get_values((a,))
+            self.assertEqual(solve.call_count, 2)
+            reset()
+            b = Variable()
+            b > 0
+            get_values((b,))
+            self.assertEqual(solve.call_count, 3)
@@ -1,7 +1,8 @@
 import operator
 import unittest
 
-from smtfe import BitVec, Clause, Function, Variable, reset
+from smtfe import BitVec, Clause, Function, Variable, reset, set_hash_consing
+from smtfe.convert import ConversionCache, join_formula
 
 
 class TestVariable(unittest.TestCase):
@@ -16,6 +17,13 @@ class TestVariable(unittest.TestCase):
         self.assertEqual(len(instances), 2)
         self.assertCountEqual(instances, [a, b])
 
+    def test_slots(self):
+        a = BitVec("a", 8)
+        clause = a > 0
+        self.assertFalse(hasattr(a, "__dict__"))
+        self.assertFalse(hasattr(clause, "__dict__"))
+        self.assertIn(a, BitVec.instances)
+
     def test_gt(self):
         a = Variable()
         a > 0
@@ -98,6 +106,30 @@ class TestVariable(unittest.TestCase):
             ),
         )
 
+    def test_nested_right_clause(self):
+        a = Variable()
+        b = Variable()
+        a * 2 + (b * 3 + 1) == 7
+        self.assertEqual(len(a.clauses), 1)
+        self.assertEqual(repr(b.clauses), "[]")
+
+    def test_identical_clauses(self):
+        a = Variable()
+        a > 0
+        a > 0
+        self.assertEqual(len(a.clauses), 2)
+        (a > 0) & True
+        self.assertEqual(len(a.clauses), 3)
+
+    def test_long_sum(self):
+        terms = [Variable() for _ in range(5000)]
+        expr = terms[0]
+        for term in terms[1:]:
+            expr = expr + term
+        expr == 0
+        self.assertEqual(len(terms[0].clauses), 1)
+        self.assertTrue(all(not term.clauses for term in terms[1:]))
+
     def test_demorgan(self):
         a = Variable("a")
         b = Variable("b")
@@ -163,3 +195,50 @@ class TestVariable(unittest.TestCase):
         myu32 == 0x0000000A
 
         self.assertEqual(repr(myu32.clauses), repr([Clause(myu32, operator.eq, 10)]))
+
+
+class TestHashConsing(unittest.TestCase):
+    def setUp(self):
+        reset()
+        set_hash_consing()
+
+    def tearDown(self):
+        set_hash_consing(False)
+
+    def test_shared(self):
+        a = Variable()
+        b = Variable()
+        c = Variable()
+        d = Variable()
+        first = (a & b) == c
+        second = (a & b) == d
+        self.assertIs(first.this, second.this)
+        self.assertIsNot(first, second)
+        self.assertIs(a * 2, a * 2)
+        self.assertIsNot(a * 2, a * True)
+        self.assertEqual(len(a.clauses), 4)
+
+    def test_ownership(self):
+        a = Variable()
+        b = Variable()
+        a & b
+        (a & b) | True
+        self.assertEqual(len(a.clauses), 2)
+        self.assertIs(a.clauses[1].this, a.clauses[0])
+
+    def test_conversion(self):
+        a = Variable()
+        b = Variable()
+        for other in range(10):
+            (a & b) == (other > 5)
+        cache = ConversionCache()
+        join_formula(a.clauses, cache)
+        self.assertEqual(len(a.clauses), 2)
+        self.assertEqual(cache.misses, 3)
+        self.assertEqual(cache.hits, 1)
+
+    def test_reset(self):
+        a = Variable()
+        clause = a > 1
+        reset()
+        self.assertIsNot(a > 1, clause)